@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from fastapi_app.routes.metrics_rollup import rollup_recent
+
+
+class Command(BaseCommand):
+    help = "Recompute DailyMetrics rows for the last N days (the charts fill missing days themselves)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=2)
+        parser.add_argument("--chunk-days", type=int, default=31, help="days computed per batch")
+
+    def handle(self, *args, **options):
+        rollup_recent(options["days"], options["chunk_days"])
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {options['days']} day(s) of metrics"))
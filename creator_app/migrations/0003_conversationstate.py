@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_conversation_state(apps, schema_editor):
+    Conversation = apps.get_model('creator_app', 'Conversation')
+    ConversationState = apps.get_model('creator_app', 'ConversationState')
+    Message = apps.get_model('creator_app', 'Message')
+
+    for convo in Conversation.objects.all().iterator():
+        msgs = Message.objects.filter(conversation_id=convo.id)
+        last = msgs.order_by('-id').first()
+        ConversationState.objects.update_or_create(
+            conversation_id=convo.id,
+            defaults={
+                'last_message_id': last.id if last else None,
+                'last_message_preview': ((last.content or '') if last else '')[:255],
+                'last_message_at': last.created_at if last else None,
+                # unread for a user = unseen messages sent by the other side
+                'user1_unread': msgs.filter(is_seen=False).exclude(sender_id=convo.user1_id).count(),
+                'user2_unread': msgs.filter(is_seen=False).exclude(sender_id=convo.user2_id).count(),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0002_remove_collaboratorprofile_portfolio_uploads_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_message_preview', models.CharField(blank=True, default='', max_length=255)),
+                ('last_message_at', models.DateTimeField(blank=True, null=True)),
+                ('user1_unread', models.PositiveIntegerField(default=0)),
+                ('user2_unread', models.PositiveIntegerField(default=0)),
+                ('user1_last_read', models.BigIntegerField(blank=True, null=True)),
+                ('user2_last_read', models.BigIntegerField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('conversation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='state', to='creator_app.conversation')),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='creator_app.message')),
+            ],
+        ),
+        migrations.RunPython(backfill_conversation_state, migrations.RunPython.noop),
+    ]
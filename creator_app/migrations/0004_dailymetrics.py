@@ -0,0 +1,80 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:03
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+
+def backfill_daily_metrics(apps, schema_editor):
+    """
+    One row per day from the first recorded activity up to today, so the
+    charts have their history as soon as this is deployed. Each source
+    table is read with a single grouped query.
+    """
+    DailyMetrics = apps.get_model('creator_app', 'DailyMetrics')
+    UserData = apps.get_model('creator_app', 'UserData')
+    BillingHistory = apps.get_model('creator_app', 'BillingHistory')
+    JobPost = apps.get_model('creator_app', 'JobPost')
+    WalletTransaction = apps.get_model('creator_app', 'WalletTransaction')
+
+    sources = [
+        (BillingHistory.objects.filter(status='paid'), 'paid_on', {'revenue': Sum('amount')}),
+        (UserData.objects.all(), 'created_at', {
+            'new_creators': Count('id', filter=Q(role__iexact='Creator')),
+            'new_collaborators': Count('id', filter=Q(role__iexact='Collaborator')),
+        }),
+        (JobPost.objects.all(), 'created_at', {'job_posts': Count('id')}),
+        (WalletTransaction.objects.all(), 'created_at', {'wallet_transactions': Count('id')}),
+    ]
+
+    days = {}
+    for queryset, field, measures in sources:
+        grouped = (
+            queryset
+            .filter(**{f'{field}__isnull': False})
+            .annotate(day=TruncDay(field))
+            .values('day')
+            .annotate(**measures)
+            .order_by()
+        )
+        for row in grouped:
+            day = row.pop('day').date()
+            days.setdefault(day, {}).update({name: value or 0 for name, value in row.items()})
+
+    today = timezone.now().date()
+    day = min(days, default=today)
+    rows = []
+    while day <= today:
+        rows.append(DailyMetrics(date=day, **days.get(day, {})))
+        day += timedelta(days=1)
+    DailyMetrics.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0003_conversationstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('new_creators', models.IntegerField(default=0)),
+                ('new_collaborators', models.IntegerField(default=0)),
+                ('job_posts', models.IntegerField(default=0)),
+                ('wallet_transactions', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.RunPython(backfill_daily_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+import creator_app.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0004_dailymetrics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(choices=[('users', 'Users'), ('transactions', 'Wallet Transactions'), ('billing', 'Billing History'), ('contracts', 'Contracts')], max_length=20)),
+                ('format', models.CharField(choices=[('csv', 'CSV'), ('excel', 'Excel')], default='csv', max_length=10)),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('file', models.FileField(blank=True, null=True, storage=creator_app.models.private_storage, upload_to='exports/')),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
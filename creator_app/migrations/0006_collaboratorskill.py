@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:08
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_skill_index(apps, schema_editor):
+    CollaboratorProfile = apps.get_model('creator_app', 'CollaboratorProfile')
+    CollaboratorSkill = apps.get_model('creator_app', 'CollaboratorSkill')
+    word_re = re.compile(r"[a-z0-9+#.]+")
+
+    def normalize(value):
+        return " ".join(str(value or "").lower().split())[:100]
+
+    rows = []
+    for profile in CollaboratorProfile.objects.all().iterator():
+        skills = profile.skills
+        if isinstance(skills, str):
+            skills = [s.strip() for s in skills.split(',') if s.strip()]
+        skills = [s for s in (skills or []) if isinstance(s, str) and s.strip()]
+
+        terms = set()
+        if normalize(profile.skill_category):
+            terms.add((normalize(profile.skill_category), 'category'))
+        for skill in skills:
+            terms.add((normalize(skill), 'skill'))
+        for source in [profile.skill_category] + skills:
+            for word in word_re.findall(str(source or '').lower()):
+                word = word.strip('.')
+                if len(word) > 1:
+                    terms.add((word[:100], 'word'))
+
+        rows.extend(CollaboratorSkill(profile_id=profile.id, term=term, kind=kind) for term, kind in terms)
+
+    CollaboratorSkill.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0005_exportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollaboratorSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(db_index=True, max_length=100)),
+                ('kind', models.CharField(choices=[('category', 'Skill Category'), ('skill', 'Skill'), ('word', 'Word')], default='skill', max_length=10)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_terms', to='creator_app.collaboratorprofile')),
+            ],
+            options={
+                'unique_together': {('profile', 'term', 'kind')},
+            },
+        ),
+        migrations.RunPython(backfill_skill_index, migrations.RunPython.noop),
+    ]
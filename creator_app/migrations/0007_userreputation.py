@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_reputation(apps, schema_editor):
+    Review = apps.get_model('creator_app', 'Review')
+    Contract = apps.get_model('creator_app', 'Contract')
+    WalletTransaction = apps.get_model('creator_app', 'WalletTransaction')
+    UserReputation = apps.get_model('creator_app', 'UserReputation')
+
+    stats = {}
+
+    def row(user_id):
+        return stats.setdefault(user_id, UserReputation(user_id=user_id))
+
+    for r in Review.objects.values('recipient_id').annotate(n=Count('id'), total=Sum('rating')).order_by():
+        rep = row(r['recipient_id'])
+        rep.review_count = r['n']
+        rep.rating_sum = r['total'] or 0
+        rep.rating_avg = rep.rating_sum / rep.review_count if rep.review_count else 0
+
+    for r in Contract.objects.filter(status='completed').values('collaborator_id').annotate(n=Count('id'), total=Sum('budget')).order_by():
+        rep = row(r['collaborator_id'])
+        rep.completed_contracts = r['n']
+        rep.contract_earnings = r['total'] or 0
+
+    for r in WalletTransaction.objects.filter(to_user__isnull=False).values('to_user_id').annotate(total=Sum('amount')).order_by():
+        row(r['to_user_id']).wallet_earnings = r['total'] or 0
+
+    UserReputation.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creator_app', '0006_collaboratorskill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserReputation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_avg', models.FloatField(db_index=True, default=0)),
+                ('completed_contracts', models.PositiveIntegerField(default=0)),
+                ('contract_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('wallet_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reputation', to='creator_app.userdata')),
+            ],
+        ),
+        migrations.RunPython(backfill_reputation, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 #models.py
 
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
@@ -161,6 +163,16 @@ class CollaboratorProfile(models.Model):
         return f"{self.user.email} - Collaborator Profile"
 
 
+class CollaboratorSkill(models.Model):
+    """ Inverted skill index: one row per normalized term of a collaborator profile (kept in sync on save). """
+    KIND_CHOICES = (("category", "Skill Category"), ("skill", "Skill"), ("word", "Word"))
+    profile = models.ForeignKey(CollaboratorProfile, on_delete=models.CASCADE, related_name="skill_terms")
+    term = models.CharField(max_length=100, db_index=True)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default="skill")
+    class Meta: unique_together = ('profile', 'term', 'kind')
+    def __str__(self): return f"{self.term} ({self.kind}) -> {self.profile_id}"
+
+
 # ============================================================
 # 4. JOBS & PROPOSALS
 # ============================================================
@@ -261,6 +273,23 @@ class Message(models.Model):
     message_type = models.CharField(max_length=20, default="text")
     def __str__(self): return f"Msg from {self.sender.email}"
 
+class ConversationState(models.Model):
+    """ Denormalized inbox row: last message + per-participant unread/read pointers. """
+    conversation = models.OneToOneField(Conversation, on_delete=models.CASCADE, related_name="state")
+    last_message = models.ForeignKey(Message, null=True, blank=True, on_delete=models.SET_NULL, related_name="+")
+    last_message_preview = models.CharField(max_length=255, blank=True, default="")
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    user1_unread = models.PositiveIntegerField(default=0)
+    user2_unread = models.PositiveIntegerField(default=0)
+    user1_last_read = models.BigIntegerField(null=True, blank=True)  # Message id
+    user2_last_read = models.BigIntegerField(null=True, blank=True)  # Message id
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def side(self, user_id): return "user1" if self.conversation.user1_id == user_id else "user2"
+    def unread_for(self, user_id): return getattr(self, f"{self.side(user_id)}_unread")
+    def last_read_for(self, user_id): return getattr(self, f"{self.side(user_id)}_last_read")
+    def __str__(self): return f"State of convo {self.conversation_id}"
+
 # ============================================================
 # 6. SUBSCRIPTIONS & PLANS
 # ============================================================
@@ -348,7 +377,48 @@ class BillingInfo(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
 # ============================================================
-# 8. MISC & UTILITIES
+# 8. ANALYTICS ROLLUPS & EXPORTS
+# ============================================================
+
+class DailyMetrics(models.Model):
+    """ One row per day (history backfilled by migration 0004, recent days kept fresh by the charts); backs the admin charts. """
+    date = models.DateField(unique=True)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    new_creators = models.IntegerField(default=0)
+    new_collaborators = models.IntegerField(default=0)
+    job_posts = models.IntegerField(default=0)
+    wallet_transactions = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta: ordering = ['date']
+    def __str__(self): return f"Metrics {self.date}"
+
+def private_storage():
+    """ Storage under PRIVATE_MEDIA_ROOT, which is not mounted at /media. """
+    return FileSystemStorage(location=settings.PRIVATE_MEDIA_ROOT)
+
+class ExportJob(models.Model):
+    """
+    Admin report export, written to PRIVATE_MEDIA_ROOT/exports/ by a background
+    worker and downloaded through the admin-only /admin/exports/{id}/download.
+    """
+    DATASET_CHOICES = (("users", "Users"), ("transactions", "Wallet Transactions"), ("billing", "Billing History"), ("contracts", "Contracts"))
+    FORMAT_CHOICES = (("csv", "CSV"), ("excel", "Excel"))
+    STATUS_CHOICES = (("queued", "Queued"), ("running", "Running"), ("done", "Done"), ("failed", "Failed"))
+    requested_by = models.ForeignKey(AdminUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="export_jobs")
+    dataset = models.CharField(max_length=20, choices=DATASET_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default="csv")
+    filters = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to="exports/", storage=private_storage, null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    def __str__(self): return f"Export #{self.id} {self.dataset} ({self.status})"
+
+# ============================================================
+# 9. MISC & UTILITIES
 # ============================================================
 
 class UserVerification(models.Model):
@@ -391,6 +461,20 @@ class Review(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     class Meta: unique_together = ('reviewer', 'recipient')
 
+class UserReputation(models.Model):
+    """ Materialized rating / earnings stats per user, refreshed whenever a review, contract or wallet transfer changes. """
+    user = models.OneToOneField(UserData, on_delete=models.CASCADE, related_name="reputation")
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_avg = models.FloatField(default=0, db_index=True)
+    completed_contracts = models.PositiveIntegerField(default=0)
+    contract_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # completed budgets as collaborator
+    wallet_earnings = models.DecimalField(max_digits=12, decimal_places=2, default=0)    # wallet transfers received
+    updated_at = models.DateTimeField(auto_now=True)
+    @property
+    def rating(self): return round(self.rating_avg or 0, 1)
+    def __str__(self): return f"Reputation {self.user_id}: {self.rating} ({self.review_count})"
+
 class TransactionHistory(models.Model):
     STATUS_CHOICES = [('Success', 'Success'), ('Pending', 'Pending'), ('Rejected', 'Rejected')]
     user = models.ForeignKey(UserData, on_delete=models.CASCADE, related_name="transactions")
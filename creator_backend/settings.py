@@ -160,6 +160,9 @@ DEFAULT_FROM_EMAIL = os.getenv("EMAIL_FROM", EMAIL_HOST_USER)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Files that must never be publicly served (MEDIA_ROOT is mounted at /media)
+PRIVATE_MEDIA_ROOT = Path(os.getenv("PRIVATE_MEDIA_ROOT", BASE_DIR / "private_media"))
+
 # TWILIO (SMS)
 TWILIO_ACCOUNT_SID= os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN= os.getenv("TWILIO_AUTH_TOKEN")
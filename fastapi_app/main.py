@@ -29,6 +29,8 @@ from fastapi_app.routes.admin_dashboard import router as admin_dashboard_router
 from fastapi_app.routes import user_dashboard
 from fastapi_app.routes import plans
 from fastapi_app.routes import collaborator_financials
+from fastapi_app.routes import search
+from fastapi_app.routes.uploads import UploadSizeLimitMiddleware, MAX_CHAT_UPLOAD_BYTES, FORM_OVERHEAD_BYTES
 # from fastapi_app.routes import role_selection
 # 1. Import the new router
 
@@ -36,6 +38,13 @@ from fastapi_app.routes import collaborator_financials
 
 app = FastAPI()
 
+# Reject oversized chat attachments before the body is received
+# (added first so CORS still wraps the 413 response)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={"/message/send": MAX_CHAT_UPLOAD_BYTES + FORM_OVERHEAD_BYTES},
+)
+
 # 👇 ADD THIS BLOCK RIGHT AFTER app = FastAPI()
 app.add_middleware(
     CORSMiddleware,
@@ -44,6 +53,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"], # 👈 This must be "*" to allow Authorization header
+    expose_headers=["X-Next-Cursor"], # 👈 Cursor paging for /message/users
 )
 app.include_router(auth_router)
 app.include_router(creator_router)
@@ -61,6 +71,7 @@ app.include_router(admin_dashboard_router)
 app.include_router(user_dashboard.router)
 app.include_router(plans.router)
 app.include_router(collaborator_financials.router)
+app.include_router(search.router)
 # app.include_router(role_selection.router)
 
 # ✅ MOUNT MEDIA FOLDER (THIS FIXES YOUR 404 ISSUE)
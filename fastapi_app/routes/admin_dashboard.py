@@ -827,21 +827,21 @@
 
 
 import fastapi_app.django_setup
-from fastapi import APIRouter, HTTPException, Depends, Query, Form, Header
+from fastapi import APIRouter, HTTPException, Depends, Query, Form, Header, Request
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta, date
-from django.db.models import Sum, Count, Q
-from django.db.models.functions import TruncMonth, TruncWeek, TruncDay
+from django.db.models import Sum, Count, Q, F, Avg, ExpressionWrapper, DurationField
+from django.db.models.functions import TruncMonth, TruncWeek, TruncDay, TruncDate
 from django.utils import timezone
 import math
 from fastapi.staticfiles import StaticFiles
 from fastapi import File, UploadFile
 import shutil
 import os
-import csv
-import io
-import openpyxl
+import base64
+import threading
+import time
 from fastapi.responses import StreamingResponse
 
 # ✅ SECURITY IMPORTS (New)
@@ -859,8 +859,14 @@ from creator_app.models import (
     Proposal,
     WalletTransaction,
     UserPreferences,
-    Contract
+    Contract,
+    ExportJob
 )
+from fastapi_app.routes.metrics_rollup import metric_series
+from fastapi_app.routes.exports import EXPORT_CHUNK_SIZE, XLSX_MEDIA_TYPE, iter_csv, iter_keyset, iter_xlsx
+from fastapi_app.routes.export_jobs import EXPORT_DATASETS, build_export_queryset, enqueue_export
+from fastapi_app.routes.downloads import ranged_file_response
+from fastapi_app.routes.response_cache import response_cache
 
 router = APIRouter(prefix="/admin", tags=["Admin Dashboard"])
 
@@ -870,6 +876,10 @@ router = APIRouter(prefix="/admin", tags=["Admin Dashboard"])
 SECRET_KEY = os.getenv("SECRET_KEY", "your_super_secret_key_123")
 ALGORITHM = "HS256"
 
+# Response cache TTLs (seconds); writes to the underlying tables invalidate sooner
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 300))
+DASHBOARD_CACHE_TTL = int(os.getenv("DASHBOARD_CACHE_TTL", 60))
+
 
 # ==============================================================================
 # 🔐 1. ADMIN LOGIN (NEW)
@@ -949,6 +959,7 @@ def get_user_dashboard_overview(user_id: int):
 
 
 @router.get("/analytics/stats")
+@response_cache.cached("analytics_stats", ttl=ANALYTICS_CACHE_TTL, groups=["billing", "users", "subscriptions"])
 def get_analytics_stats(admin: AdminUser = Depends(verify_admin)):
     """ Top 4 Cards for Analytics Page """
     now = timezone.now()
@@ -975,20 +986,24 @@ def get_user_overview_chart(admin: AdminUser = Depends(verify_admin)):
     """ Mixed Chart: Creators vs Collaborators vs Transactions (Last 6 Months) """
     now = timezone.now()
     data = []
-    
-    for i in range(5, -1, -1):
-        month_start = (now - timedelta(days=i*30)).replace(day=1)
+
+    month_starts = [(now - timedelta(days=i*30)).replace(day=1).date() for i in range(5, -1, -1)]
+    series = metric_series(
+        "month", month_starts[0], now.date(),
+        creators=Sum("new_creators"),
+        collabs=Sum("new_collaborators"),
+        txns=Sum("wallet_transactions")
+    )
+
+    for month_start in month_starts:
         month_label = month_start.strftime("%b") # Jan, Feb
-        
-        creators = UserData.objects.filter(role__iexact="Creator", created_at__year=month_start.year, created_at__month=month_start.month).count()
-        collabs = UserData.objects.filter(role__iexact="Collaborator", created_at__year=month_start.year, created_at__month=month_start.month).count()
-        txns = WalletTransaction.objects.filter(created_at__year=month_start.year, created_at__month=month_start.month).count()
+        bucket = series[month_start]
 
         data.append({
             "Month": month_label,
-            "Creator": creators,
-            "Collaborator": collabs,
-            "Transactions": txns
+            "Creator": bucket["creators"],
+            "Collaborator": bucket["collabs"],
+            "Transactions": bucket["txns"]
         })
     return data
 
@@ -996,26 +1011,8 @@ def get_user_overview_chart(admin: AdminUser = Depends(verify_admin)):
 def get_task_performance(admin: AdminUser = Depends(verify_admin)):
     """
     Returns real task performance stats from the CONTRACTS table.
+    One aggregate query: conditional COUNTs + average delay of late contracts.
     """
-    # 1. Total Targets (Total Contracts Created)
-    total_contracts = Contract.objects.count()
-    
-    # 2. Completed Tasks (Contracts where status is 'completed')
-    completed_contracts = Contract.objects.filter(status__iexact="completed").count()
-    
-    # 3. Calculate "Late" vs "On Time"
-    late_count = 0
-    contracts = Contract.objects.filter(status__iexact="completed")
-    
-    for c in contracts:
-        if c.end_date and c.updated_at:
-            completion_date = c.updated_at.date()
-            if completion_date > c.end_date:
-                late_count += 1
-
-    on_time = completed_contracts - late_count
-
-    # 4. Growth Calculation
     now = datetime.now()
     
     if now.month == 1:
@@ -1025,24 +1022,41 @@ def get_task_performance(admin: AdminUser = Depends(verify_admin)):
         last_month_num = now.month - 1
         last_month_year = now.year
 
-    this_month = Contract.objects.filter(start_date__month=now.month, start_date__year=now.year).count()
-    last_month = Contract.objects.filter(start_date__month=last_month_num, start_date__year=last_month_year).count()
+    completed = Q(status__iexact="completed")
+    # Late = completed (last update) after the agreed end date
+    late = completed & Q(end_date__isnull=False, updated_at__date__gt=F("end_date"))
+    delay = ExpressionWrapper(TruncDate("updated_at") - F("end_date"), output_field=DurationField())
+
+    stats = Contract.objects.aggregate(
+        total_contracts=Count("id"),
+        completed_contracts=Count("id", filter=completed),
+        late_count=Count("id", filter=late),
+        avg_delay=Avg(delay, filter=late),
+        this_month=Count("id", filter=Q(start_date__month=now.month, start_date__year=now.year)),
+        last_month=Count("id", filter=Q(start_date__month=last_month_num, start_date__year=last_month_year)),
+        this_year=Count("id", filter=Q(start_date__year=now.year)),
+    )
 
+    this_month = stats["this_month"]
+    last_month = stats["last_month"]
     if last_month > 0:
         growth = ((this_month - last_month) / last_month) * 100
     else:
         growth = 100 if this_month > 0 else 0
 
+    avg_delay = stats["avg_delay"]
     return {
-        "total_completed": completed_contracts,
-        "total_target": total_contracts,
-        "on_time": on_time,
-        "late": late_count,
-        "tasks_this_year": Contract.objects.filter(start_date__year=now.year).count(),
+        "total_completed": stats["completed_contracts"],
+        "total_target": stats["total_contracts"],
+        "on_time": stats["completed_contracts"] - stats["late_count"],
+        "late": stats["late_count"],
+        "avg_days_late": round(avg_delay.total_seconds() / 86400, 1) if avg_delay else 0,
+        "tasks_this_year": stats["this_year"],
         "growth": round(growth, 1)
     }
 
 @router.get("/analytics/traffic-data")
+@response_cache.cached("traffic_data", ttl=ANALYTICS_CACHE_TTL, groups=["users"])
 def get_traffic_data(admin: AdminUser = Depends(verify_admin)):
     """
     Distributes TOTAL USER COUNT into Devices/Locations
@@ -1065,6 +1079,7 @@ def get_traffic_data(admin: AdminUser = Depends(verify_admin)):
     }
 
 @router.get("/analytics/revenue-splits")
+@response_cache.cached("revenue_splits", ttl=ANALYTICS_CACHE_TTL, groups=["billing", "wallet", "users"])
 def get_revenue_splits(admin: AdminUser = Depends(verify_admin)):
     """ Pie Chart Data """
     platform_fees = BillingHistory.objects.filter(status="paid").aggregate(total=Sum('amount'))['total'] or 0.0
@@ -1100,6 +1115,13 @@ def get_top_collaborators(limit: int = 5, admin: AdminUser = Depends(verify_admi
 
 @router.get("/dashboard/stats")
 def get_dashboard_stats(admin: AdminUser = Depends(verify_admin)):
+    return {
+        "admin_name": getattr(admin, 'name', 'Admin'), # Updated to use AdminUser name
+        **get_dashboard_totals()
+    }
+
+@response_cache.cached("dashboard_stats", ttl=DASHBOARD_CACHE_TTL, groups=["users", "jobs", "billing"])
+def get_dashboard_totals():
     total_users = UserData.objects.count()
     active_projects = JobPost.objects.filter(Q(status__iexact="posted") | Q(status__iexact="in_progress")).count()
     completed_tasks = JobPost.objects.filter(status__iexact="completed").count()
@@ -1107,7 +1129,6 @@ def get_dashboard_stats(admin: AdminUser = Depends(verify_admin)):
     total_revenue = revenue_agg['total'] or 0.0
 
     return {
-        "admin_name": getattr(admin, 'name', 'Admin'), # Updated to use AdminUser name
         "total_users": total_users,
         "active_projects": active_projects,
         "completed_tasks": completed_tasks,
@@ -1121,33 +1142,28 @@ def get_revenue_chart(
     year: int = Query(default=timezone.now().year, description="Select year for Yearly view"),
     admin: AdminUser = Depends(verify_admin)
 ):
-    now = timezone.now()
+    today = timezone.now().date()
     labels = []
     data = []
 
     if filter == "Weekly":
-        for i in range(6, -1, -1):
-            day = now - timedelta(days=i)
+        series = metric_series("day", today - timedelta(days=6), today, total=Sum("revenue"))
+        for day, bucket in series.items():
             labels.append(day.strftime("%a"))
-            total = BillingHistory.objects.filter(paid_on__date=day.date(), status="paid").aggregate(s=Sum('amount'))['s'] or 0
-            data.append(float(total))
-            
+            data.append(float(bucket["total"]))
+
     elif filter == "Monthly":
-        for i in range(3, -1, -1):
-            week_start = now - timedelta(weeks=i)
-            labels.append(f"Week {4-i}")
-            total = BillingHistory.objects.filter(paid_on__week=week_start.isocalendar()[1], paid_on__year=week_start.year, status="paid").aggregate(s=Sum('amount'))['s'] or 0
-            data.append(float(total))
+        # ISO weeks (Mon..Sun) of the last 4 weeks
+        first_monday = today - timedelta(weeks=3, days=today.weekday())
+        series = metric_series("week", first_monday, today, total=Sum("revenue"))
+        for i, bucket in enumerate(series.values()):
+            labels.append(f"Week {i+1}")
+            data.append(float(bucket["total"]))
 
     else: # Yearly
         labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        for i in range(1, 13):
-            total = BillingHistory.objects.filter(
-                paid_on__month=i,
-                paid_on__year=year,
-                status="paid"
-            ).aggregate(s=Sum('amount'))['s'] or 0
-            data.append(float(total))
+        series = metric_series("month", date(year, 1, 1), date(year, 12, 31), total=Sum("revenue"))
+        data = [float(bucket["total"]) for bucket in series.values()]
 
     return {"labels": labels, "data": data}
 
@@ -1166,57 +1182,47 @@ def get_project_status_charts(time_range: str = "All", admin: AdminUser = Depend
         d = now - timedelta(days=2)
         base_query = base_query.filter(updated_at__date=d.date())
 
-    completed = base_query.filter(status__iexact="completed").count()
-    on_hold = base_query.filter(
-        Q(status__iexact="draft") |
-        Q(status__iexact="on_hold") |
-        Q(status__iexact="awaiting") 
-    ).count()
-    in_progress = base_query.filter(
-        Q(status__iexact="posted") |
-        Q(status__iexact="in_progress")
-    ).count()
-    
-    return {
-        "completed": completed,
-        "on_hold": on_hold,
-        "in_progress": in_progress,
-    }
+    # Single pass: one conditional COUNT per slice
+    return base_query.aggregate(
+        completed=Count("id", filter=Q(status__iexact="completed")),
+        on_hold=Count("id", filter=(
+            Q(status__iexact="draft") |
+            Q(status__iexact="on_hold") |
+            Q(status__iexact="awaiting")
+        )),
+        in_progress=Count("id", filter=(
+            Q(status__iexact="posted") |
+            Q(status__iexact="in_progress")
+        )),
+    )
 
 @router.get("/dashboard/charts/progress")
 def get_progress_chart(
     filter: str = Query("Week", enum=["Week", "Month", "Year"]),
     admin: AdminUser = Depends(verify_admin)
 ):
-    now = timezone.now()
+    today = timezone.now().date()
     labels = []
     values = []
 
     if filter == "Week":
-        for i in range(6, -1, -1):
-            day = now - timedelta(days=i)
+        series = metric_series("day", today - timedelta(days=6), today, count=Sum("job_posts"))
+        for day, bucket in series.items():
             labels.append(day.strftime("%d %b"))
-            count = JobPost.objects.filter(created_at__date=day.date()).count()
-            values.append(count)
+            values.append(bucket["count"])
 
     elif filter == "Month":
+        # six 5-day windows (day-5, day], summed from the daily series
+        series = metric_series("day", today - timedelta(days=29), today, count=Sum("job_posts"))
         for i in range(5, -1, -1):
-            day = now - timedelta(days=i*5)
+            day = today - timedelta(days=i*5)
             labels.append(day.strftime("%d %b"))
-            count = JobPost.objects.filter(
-                created_at__date__lte=day.date(),
-                created_at__date__gt=(day-timedelta(days=5)).date()
-            ).count()
-            values.append(count)
+            values.append(sum(series[day - timedelta(days=k)]["count"] for k in range(5)))
 
     elif filter == "Year":
         labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        for i in range(1, 13):
-            count = JobPost.objects.filter(
-                created_at__year=now.year,
-                created_at__month=i
-            ).count()
-            values.append(count)
+        series = metric_series("month", date(today.year, 1, 1), date(today.year, 12, 31), count=Sum("job_posts"))
+        values = [bucket["count"] for bucket in series.values()]
 
     return {"labels": labels, "data": values}
 
@@ -1273,6 +1279,35 @@ def get_active_projects_table(limit: int = 5, admin: AdminUser = Depends(verify_
 class UserUpdateSchema(BaseModel):
     name: Optional[str] = None # Updated to accept full name
 
+# Totals are cached per filter combination; paging itself never counts
+USER_COUNT_CACHE_TTL = int(os.getenv("ADMIN_USER_COUNT_TTL", 60))
+_user_count_lock = threading.Lock()
+_user_count_cache = {}  # (role, search) -> (total, cached_at)
+
+def cached_user_count(query, role, search):
+    key = ((role or "").lower(), search or "")
+    now = time.monotonic()
+    with _user_count_lock:
+        hit = _user_count_cache.get(key)
+        if hit and now - hit[1] < USER_COUNT_CACHE_TTL:
+            return hit[0]
+
+    total = query.count()
+    with _user_count_lock:
+        _user_count_cache[key] = (total, now)
+    return total
+
+def encode_user_cursor(u):
+    raw = f"{u.created_at.isoformat()}|{u.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_user_cursor(cursor: str):
+    try:
+        created_at, user_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(user_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/users")
 def get_all_users(
     role: Optional[str] = None,
@@ -1280,19 +1315,31 @@ def get_all_users(
     search: Optional[str] = None,
     page: int = 1,
     page_size: int = 10,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset paging)"),
     admin: AdminUser = Depends(verify_admin)
 ):
-    query = UserData.objects.all().order_by('-created_at')
+    query = UserData.objects.all()
 
     if role:
         query = query.filter(role__iexact=role)
     if search:
         query = query.filter(Q(first_name__icontains=search) | Q(email__icontains=search))
     
-    total = query.count()
-    start = (page - 1) * page_size
-    end = start + page_size
-    users = query[start:end]
+    total = cached_user_count(query, role, search)
+    query = query.order_by('-created_at', '-id')
+
+    if cursor:
+        # Keyset: rows strictly after (created_at, id) of the last row seen
+        created_at, last_id = decode_user_cursor(cursor)
+        query = query.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id))
+        users = list(query[:page_size + 1])
+    else:
+        # Legacy page numbers (first page / direct jumps)
+        start = (page - 1) * page_size
+        users = list(query[start:start + page_size + 1])
+
+    has_more = len(users) > page_size
+    users = users[:page_size]
 
     results = []
     for u in users:
@@ -1311,6 +1358,7 @@ def get_all_users(
         "total_users": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": encode_user_cursor(users[-1]) if has_more else None,
         "data": results
     }
 
@@ -1370,6 +1418,7 @@ def delete_user(user_id: int, admin: AdminUser = Depends(verify_admin)):
 # ==============================================================================
 
 @router.get("/subscriptions/stats")
+@response_cache.cached("subscription_stats", ttl=ANALYTICS_CACHE_TTL, groups=["users", "subscriptions"])
 def get_subscription_stats(admin: AdminUser = Depends(verify_admin)):
     total_users = UserData.objects.count()
     pro_count = UserSubscription.objects.filter(current_plan__icontains="Pro").count()
@@ -1469,78 +1518,111 @@ def export_users_custom(
     search: Optional[str] = None,
     admin: AdminUser = Depends(verify_admin)
 ):
-    query = UserData.objects.all().order_by('-created_at')
-
-    if role:
-        query = query.filter(role__iexact=role)
-    if status:
-        query = query.filter(status__iexact=status)
-    if search:
-        query = query.filter(Q(first_name__icontains=search) | Q(email__icontains=search))
-
-    if from_date:
-        query = query.filter(created_at__date__gte=from_date)
-    if to_date:
-        query = query.filter(created_at__date__lte=to_date)
+    """
+    CSV streams row by row as users are read. XLSX can't send anything until
+    the workbook is complete; for very large reports use POST /admin/exports.
+    """
+    filters = {"role": role, "status": status, "search": search,
+               "from_date": from_date.isoformat() if from_date else None,
+               "to_date": to_date.isoformat() if to_date else None}
+    filters = {k: v for k, v in filters.items() if v}
+    query = build_export_queryset("users", filters)
 
-    users = list(query)
-    headers = ["Full Name", "Email", "Role", "Status", "Joined Date"]
+    spec = EXPORT_DATASETS["users"]
+    headers = spec["headers"]
+    # Newest first by id (follows created_at), one short query per chunk
+    rows = (spec["row"](u) for u in iter_keyset(query, "id", EXPORT_CHUNK_SIZE))
 
     if format == "csv":
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(headers)
-        
-        for u in users:
-            full_name = f"{u.first_name} {u.last_name}".strip()
-            joined = u.created_at.strftime("%Y-%m-%d") if u.created_at else "N/A"
-            user_status = getattr(u, 'status', 'Active')
-
-            writer.writerow([full_name, u.email, u.role, user_status, joined])
-            
-        output.seek(0)
         filename = f"users_export_{datetime.now().strftime('%Y%m%d')}.csv"
         return StreamingResponse(
-            iter([output.getvalue()]),
+            iter_csv(headers, rows),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
 
     elif format == "excel":
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Users List"
-        ws.append(headers)
-        
-        for cell in ws[1]:
-            cell.font = openpyxl.styles.Font(bold=True, color="FFFFFF")
-            cell.fill = openpyxl.styles.PatternFill(start_color="2e1065", end_color="2e1065", fill_type="solid")
-
-        for u in users:
-            full_name = f"{u.first_name} {u.last_name}".strip()
-            joined = u.created_at.strftime("%Y-%m-%d") if u.created_at else "N/A"
-            user_status = getattr(u, 'status', 'Active')
-
-            ws.append([full_name, u.email, u.role, user_status, joined])
-            
-        for col in ws.columns:
-             max_length = 0
-             column = col[0].column_letter 
-             for cell in col:
-                 try:
-                     if len(str(cell.value)) > max_length:
-                         max_length = len(str(cell.value))
-                 except: pass
-             adjusted_width = (max_length + 2) * 1.2
-             ws.column_dimensions[column].width = adjusted_width
-
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-
         filename = f"users_export_{datetime.now().strftime('%Y%m%d')}.xlsx"
         return StreamingResponse(
-            buffer,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            iter_xlsx(spec["title"], headers, rows, widths=spec["widths"]),
+            media_type=XLSX_MEDIA_TYPE,
             headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
\ No newline at end of file
+        )
+
+
+# ==============================================================================
+# 📦 BACKGROUND EXPORT JOBS (large reports)
+# ==============================================================================
+
+class ExportJobSchema(BaseModel):
+    dataset: str                      # users | transactions | billing | contracts
+    format: str = "csv"               # csv | excel
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
+    status: Optional[str] = None
+    role: Optional[str] = None        # users only
+    search: Optional[str] = None      # users only
+
+def serialize_export_job(job: ExportJob, request: Request):
+    progress = 100 if job.status == "done" else (
+        round(job.processed_rows * 100 / job.total_rows, 1) if job.total_rows else 0
+    )
+    download_url = None
+    if job.status == "done" and job.file:
+        download_url = str(request.url_for("download_export_job", job_id=job.id))
+    return {
+        "id": job.id,
+        "dataset": job.dataset,
+        "format": job.format,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "progress": progress,
+        "download_url": download_url,
+        "error": job.error if job.status == "failed" else None,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+@router.post("/exports")
+def create_export_job(data: ExportJobSchema, request: Request, admin: AdminUser = Depends(verify_admin)):
+    if data.dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=400, detail=f"Unknown dataset. Use one of: {', '.join(EXPORT_DATASETS)}")
+    if data.format not in ("csv", "excel"):
+        raise HTTPException(status_code=400, detail="Format must be csv or excel")
+
+    filters = data.dict(exclude={"dataset", "format"}, exclude_none=True)
+    for key in ("from_date", "to_date"):
+        if key in filters:
+            filters[key] = filters[key].isoformat()
+
+    job = ExportJob.objects.create(
+        requested_by=admin,
+        dataset=data.dataset,
+        format=data.format,
+        filters=filters
+    )
+    enqueue_export(job)
+    return serialize_export_job(job, request)
+
+@router.get("/exports/{job_id}")
+def get_export_job(job_id: int, request: Request, admin: AdminUser = Depends(verify_admin)):
+    job = ExportJob.objects.filter(id=job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return serialize_export_job(job, request)
+
+@router.get("/exports/{job_id}/download", name="download_export_job")
+def download_export_job(job_id: int, request: Request, admin: AdminUser = Depends(verify_admin)):
+    """ Finished exports live outside MEDIA_ROOT, so this is the only way to fetch them. """
+    job = ExportJob.objects.filter(id=job_id, status="done").first()
+    if not job or not job.file:
+        raise HTTPException(status_code=404, detail="Export file not found")
+
+    path = job.file.path
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Export file not found")
+
+    media_type = "text/csv" if job.format == "csv" else XLSX_MEDIA_TYPE
+    filename = os.path.basename(job.file.name)
+    return ranged_file_response(request, path, media_type, f"attachment; filename={filename}")
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Dict, Iterable, Set
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+
+
+# =========================================================
+# 🔹 CHAT CONNECTION MANAGER
+# =========================================================
+class ChatConnectionManager:
+    """
+    Keeps the open chat sockets for every user and pushes events to them.
+
+    Message routes are plain `def` handlers, so they run in the threadpool.
+    `publish` hands the actual send over to the event loop the sockets
+    were accepted on and returns immediately.
+    """
+
+    def __init__(self):
+        self.connections: Dict[int, Set[WebSocket]] = {}
+        self.loop = None
+
+    async def connect(self, user_id: int, websocket: WebSocket):
+        await websocket.accept()
+        self.loop = asyncio.get_running_loop()
+        self.connections.setdefault(user_id, set()).add(websocket)
+
+    def disconnect(self, user_id: int, websocket: WebSocket):
+        sockets = self.connections.get(user_id)
+        if not sockets:
+            return
+        sockets.discard(websocket)
+        if not sockets:
+            self.connections.pop(user_id, None)
+
+    def is_connected(self, user_id: int) -> bool:
+        return bool(self.connections.get(user_id))
+
+    async def send_to_user(self, user_id: int, event: dict):
+        for websocket in list(self.connections.get(user_id, ())):
+            try:
+                await websocket.send_json(event)
+            except Exception:
+                # Socket died without a clean close → forget it
+                self.disconnect(user_id, websocket)
+
+    def publish(self, user_ids: Iterable[int], event: dict):
+        """
+        Fire-and-forget push of `event` to every socket of `user_ids`.
+        Safe to call from sync handlers and from the event loop itself.
+        """
+        if self.loop is None or self.loop.is_closed():
+            return
+
+        targets = [uid for uid in set(user_ids) if uid and self.is_connected(uid)]
+        if not targets:
+            return
+
+        payload = jsonable_encoder(event)
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        for uid in targets:
+            if running_loop is self.loop:
+                self.loop.create_task(self.send_to_user(uid, payload))
+            else:
+                asyncio.run_coroutine_threadsafe(self.send_to_user(uid, payload), self.loop)
+
+
+manager = ChatConnectionManager()
@@ -497,18 +497,17 @@ from typing import Optional
 from django.db.models import Q
 from fastapi import APIRouter, HTTPException, Form
 from django.conf import settings
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Response
 from typing import Optional
 
 from asgiref.sync import sync_to_async
 from django.db.models import Q, F, Value
-from django.db.models.functions import Concat
+from django.db.models.functions import Concat, Floor
 import random
 import string
 from pathlib import Path as PathLib
-from django.db.models import Avg, Count
+from django.db.models import Count
 from django.core.files.base import ContentFile
-import pycountry
 
 # Import your Django Models
 from creator_app.models import (
@@ -522,6 +521,11 @@ from creator_app.models import (
     Contract, 
     Review
 )
+from fastapi_app.routes.skill_index import profile_ids_with_skill_prefix, profile_ids_with_all_skills
+from fastapi_app.routes.matching import engine as match_engine
+from fastapi_app.routes.job_search import job_index
+from fastapi_app.routes.reputation import get_reputation, reputation_of
+from fastapi_app.routes.geo import get_country_code
 
 router = APIRouter(prefix="/collaborator", tags=["Collaborator"])
 
@@ -535,8 +539,7 @@ def generate_random_digits(length=4):
 # ==============================================================================
 #  1. SEARCH & FILTER
 # ==============================================================================
-@router.get("/search")
-def search_collaborators(
+def filter_collaborator_profiles(
     search: Optional[str] = None,
     skill_category: Optional[str] = None,
     location: Optional[str] = None,
@@ -544,17 +547,23 @@ def search_collaborators(
     max_price: Optional[float] = None,
     experience: Optional[str] = None,
     language: Optional[str] = None,
-    availability: Optional[str] = None
+    availability: Optional[str] = None,
+    skills: Optional[str] = None # "Python, React" → must have all of them
 ):
-    profiles = CollaboratorProfile.objects.all()
+    profiles = CollaboratorProfile.objects.select_related("user")
 
     if search:
         profiles = profiles.filter(
             Q(name__icontains=search) |
             Q(skill_category__icontains=search) |
-            Q(skills__icontains=search) # Also search inside the JSON list
+            Q(id__in=profile_ids_with_skill_prefix(search)) # Skill index instead of LIKE over JSON
         )
 
+    if skills:
+        wanted = [s.strip() for s in skills.split(",") if s.strip()]
+        if wanted:
+            profiles = profiles.filter(id__in=profile_ids_with_all_skills(wanted))
+
     if skill_category:
         profiles = profiles.filter(skill_category__iexact=skill_category)
 
@@ -576,24 +585,131 @@ def search_collaborators(
     if availability:
         profiles = profiles.filter(availability__iexact=availability)
 
-    return [
-        {
-            "id": p.id,
-            "email": p.user.email,
-            "name": p.name,
-            "skill_category": p.skill_category,
-            "skills": p.skills,  # Return the list of skills
-            "pricing": f"{p.pricing_amount} {p.pricing_unit}",
-            "location": p.location,
-            "experience": p.experience,
-            "language": p.language,
-            "availability": p.availability,
-            "social_link": p.social_link,
-            "portfolio_link": p.portfolio_link,
-            "rating": p.skills_rating
-        }
-        for p in profiles
-    ]
+    return profiles
+
+
+def serialize_collaborator_search_result(p):
+    return {
+        "id": p.id,
+        "email": p.user.email,
+        "name": p.name,
+        "skill_category": p.skill_category,
+        "skills": p.skills,  # Return the list of skills
+        "pricing": f"{p.pricing_amount} {p.pricing_unit}",
+        "location": p.location,
+        "experience": p.experience,
+        "language": p.language,
+        "availability": p.availability,
+        "social_link": p.social_link,
+        "portfolio_link": p.portfolio_link,
+        "rating": p.skills_rating
+    }
+
+
+@router.get("/search")
+def search_collaborators(
+    search: Optional[str] = None,
+    skill_category: Optional[str] = None,
+    location: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    experience: Optional[str] = None,
+    language: Optional[str] = None,
+    availability: Optional[str] = None,
+    skills: Optional[str] = None # "Python, React" → must have all of them
+):
+    profiles = filter_collaborator_profiles(
+        search, skill_category, location, min_price, max_price,
+        experience, language, availability, skills
+    )
+    return [serialize_collaborator_search_result(p) for p in profiles]
+
+
+FACET_FIELDS = ["skill_category", "location", "experience", "language", "availability"]
+
+
+def collaborator_facets(profiles, price_bucket: int):
+    """
+    Facet value counts + price histogram for the filtered profiles in ONE
+    grouped query: GROUP BY (facet fields, price bucket), rolled up in Python.
+    Values are merged case-insensitively (filters use iexact/icontains).
+    """
+    rows = (
+        profiles
+        .annotate(price_bucket=Floor(F("pricing_amount") / price_bucket))
+        .values(*FACET_FIELDS, "price_bucket")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+
+    counts = {field: {} for field in FACET_FIELDS}
+    labels = {field: {} for field in FACET_FIELDS}
+    histogram = {}
+    total = 0
+    for row in rows:
+        total += row["n"]
+        for field in FACET_FIELDS:
+            value = (row[field] or "").strip()
+            if not value:
+                continue
+            key = value.lower()
+            counts[field][key] = counts[field].get(key, 0) + row["n"]
+            labels[field].setdefault(key, value)
+        if row["price_bucket"] is not None:
+            bucket = int(row["price_bucket"])
+            histogram[bucket] = histogram.get(bucket, 0) + row["n"]
+
+    return {
+        "total": total,
+        "facets": {
+            field: sorted(
+                ({"value": labels[field][key], "count": n} for key, n in counts[field].items()),
+                key=lambda item: (-item["count"], item["value"].lower())
+            )
+            for field in FACET_FIELDS
+        },
+        "price_histogram": [
+            {"min": bucket * price_bucket, "max": (bucket + 1) * price_bucket, "count": histogram[bucket]}
+            for bucket in sorted(histogram)
+        ],
+    }
+
+
+@router.get("/search/faceted")
+def search_collaborators_faceted(
+    search: Optional[str] = None,
+    skill_category: Optional[str] = None,
+    location: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    experience: Optional[str] = None,
+    language: Optional[str] = None,
+    availability: Optional[str] = None,
+    skills: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[int] = Query(None, description="next_cursor of the previous page"),
+    price_bucket: int = Query(50, ge=1, description="Width of the price histogram buckets")
+):
+    """
+    Same filters as /search, plus facet counts and a price histogram for the
+    current filter set, so the filter sidebar is built from one request.
+    """
+    profiles = filter_collaborator_profiles(
+        search, skill_category, location, min_price, max_price,
+        experience, language, availability, skills
+    )
+
+    page = profiles.order_by("-id")
+    if cursor:
+        page = page.filter(id__lt=cursor)
+    page = list(page[:limit + 1])
+    next_cursor = page[limit - 1].id if len(page) > limit else None
+
+    return {
+        "results": [serialize_collaborator_search_result(p) for p in page[:limit]],
+        "next_cursor": next_cursor,
+        **collaborator_facets(profiles, price_bucket),
+    }
 
 
 # ==============================================================================
@@ -845,62 +961,25 @@ def track_job_view(user_id: int, job_id: int):
 #  4. FEEDS (Best Match, Saved, Recent)
 # ==============================================================================
 @router.get("/jobs/best-match/{user_id}")
-def get_best_match_jobs(user_id: int):
+def get_best_match_jobs(user_id: int, limit: int = Query(50, ge=1, le=200)):
     """
     Returns jobs matching the user's skills.
+    Ranked by TF-IDF cosine similarity (match_score = 0-100) from the in-memory matching engine.
     """
     try:
         profile = CollaboratorProfile.objects.get(user_id=user_id)
-        
-        # Safely get user skills
-        user_skills = getattr(profile, 'skills', [])
-        
-        # Handle if stored as string by mistake in older DB entries
-        if isinstance(user_skills, str):
-            user_skills = [s.strip().lower() for s in user_skills.split(',') if s.strip()]
-        else:
-            # Ensure all lower case for comparison
-            user_skills = [s.lower() for s in user_skills]
 
-        # Add category as a keyword
-        if profile.skill_category:
-            user_skills.append(profile.skill_category.strip().lower())
-        
-        if not user_skills:
+        ranked = match_engine.jobs_for_profile(profile, k=limit)
+        if not ranked:
             return [] # No skills, no match
 
-        # Get all posted jobs
-        jobs = JobPost.objects.filter(status__iexact="posted").order_by('-created_at')
-        scored_jobs = []
-
-        for job in jobs:
-            score = 0
-            # Normalize job skills
-            job_skills = getattr(job, 'skills', [])
-            if isinstance(job_skills, str):
-                job_skills = [s.strip().lower() for s in job_skills.split(',')]
-            else:
-                job_skills = [s.lower() for s in job_skills]
-
-            job_title = job.title.lower()
-            job_desc = job.description.lower()
-
-            for my_skill in user_skills:
-                # 10 Points: Exact Skill Match
-                if my_skill in job_skills:
-                    score += 10
-                # 5 Points: Skill in Title
-                elif my_skill in job_title:
-                    score += 5
-                # 2 Points: Skill in Description
-                elif my_skill in job_desc:
-                    score += 2
-
-            if score > 0:
-                scored_jobs.append({"job": job, "score": score})
-
-        # Sort by highest score
-        scored_jobs.sort(key=lambda x: x["score"], reverse=True)
+        jobs = JobPost.objects.in_bulk([job_id for job_id, _ in ranked])
+        scored_jobs = [
+            {"job": jobs[job_id], "score": round(score * 100)}
+            for job_id, score in ranked
+            # the index can lag other workers by a few minutes → re-check
+            if job_id in jobs and jobs[job_id].status.lower() == "posted"
+        ]
 
         return [
             {
@@ -999,16 +1078,12 @@ def add_collaborator_review(
             defaults={"rating": rating, "comment": comment}
         )
         
-        # 3. Update Average Rating
-        try:
-            profile = CollaboratorProfile.objects.get(user=collaborator)
-            all_reviews = Review.objects.filter(recipient=collaborator)
-            if all_reviews.exists():
-                avg = sum(r.rating for r in all_reviews) / all_reviews.count()
-                profile.skills_rating = int(avg)
-                profile.save()
-        except CollaboratorProfile.DoesNotExist:
-            pass
+        # 3. Update Average Rating (the reputation row was refreshed by the review save)
+        reputation = get_reputation(collaborator.id)
+        if reputation.review_count:
+            CollaboratorProfile.objects.filter(user=collaborator).update(
+                skills_rating=int(reputation.rating_avg)
+            )
 
         return {"status": "success", "message": "Review saved successfully"}
 
@@ -1031,23 +1106,13 @@ def get_collaborator_reviews(user_id: int):
     ]
 
 
-
-def get_country_code(country_name: str | None):
-    if not country_name:
-        return None
-    try:
-        country = pycountry.countries.search_fuzzy(country_name)[0]
-        return country.alpha_2
-    except Exception:
-        return None
-
 @router.get("/jobs/{job_id}")
 def get_job_details(job_id: int):
     try:
         job = JobPost.objects.get(id=job_id)
 
         # 🔹 Creator = UserData (IMPORTANT CHANGE)
-        creator = UserData.objects.get(id=job.employer_id)
+        creator = UserData.objects.select_related("reputation").get(id=job.employer_id)
 
         # 📍 Location from UserData
         country = creator.location or "Unknown"
@@ -1055,15 +1120,9 @@ def get_job_details(job_id: int):
         country_code = get_country_code(country)
 
         # ⭐ Rating & reviews (creator as recipient)
-        review_stats = Review.objects.filter(
-            recipient=creator
-        ).aggregate(
-            avg_rating=Avg("rating"),
-            total_reviews=Count("id")
-        )
-
-        rating = round(review_stats["avg_rating"] or 0, 1)
-        reviews = review_stats["total_reviews"]
+        reputation = reputation_of(creator)
+        rating = reputation.rating
+        reviews = reputation.review_count
 
         return {
             "id": job.id,
@@ -1095,26 +1154,51 @@ def get_job_details(job_id: int):
         raise HTTPException(status_code=404, detail="Creator not found")
 
 
-@router.get("/job-search")
-def search_jobs(search: Optional[str] = None):
+def parse_job_search_cursor(cursor: str, ranked: bool):
+    """ Search mode: "<score>:<job id>" (relevance order); browse mode: "<job id>" (newest first). """
+    try:
+        if ranked:
+            score, job_id = cursor.split(":", 1)
+            return float(score), int(job_id)
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
+@router.get("/job-search")
+def search_jobs(
+    response: Response,
+    search: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page")
+):
     jobs = JobPost.objects.select_related(
         "employer",
         "employer__creatorprofile"
     ).filter(status="posted")
 
-    if search:
-        jobs = jobs.filter(
-            Q(title__icontains=search) |
-            Q(description__icontains=search) |
-            Q(skills__icontains=search) |
-
-            # ✅ creator name from CreatorProfile
-            Q(employer__creatorprofile__creator_name__icontains=search) |
-
-            # ✅ creator location from CreatorProfile
-            Q(employer__creatorprofile__location__icontains=search)
-        )
+    next_cursor = None
+    if search and search.strip():
+        # BM25 over title / skills / creator name / location / description
+        after = parse_job_search_cursor(cursor, ranked=True) if cursor else None
+        ranked = job_index.search(search, k=limit + 1, after=after)
+        if len(ranked) > limit:
+            ranked = ranked[:limit]
+            next_cursor = f"{ranked[-1][1]}:{ranked[-1][0]}"
+
+        by_id = jobs.in_bulk([job_id for job_id, _ in ranked])
+        jobs = [by_id[job_id] for job_id, _ in ranked if job_id in by_id]
+    else:
+        jobs = jobs.order_by("-id")
+        if cursor:
+            jobs = jobs.filter(id__lt=parse_job_search_cursor(cursor, ranked=False))
+        jobs = list(jobs[:limit + 1])
+        if len(jobs) > limit:
+            jobs = jobs[:limit]
+            next_cursor = str(jobs[-1].id)
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
 
     results = []
 
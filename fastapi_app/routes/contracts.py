@@ -1,11 +1,8 @@
 import fastapi_app.django_setup
 import os
 import shutil  # Used to save files manually
-import zipfile
-import io
  
 from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form, Query
-from fastapi.responses import FileResponse, StreamingResponse  # ✅ Required for downloading files
 from typing import Optional
 from django.conf import settings  # To get the absolute path to MEDIA_ROOT
 from django.db.models import Q
@@ -15,6 +12,9 @@ from creator_app.models import Contract, Invitation, JobPost, UserData, timezone
 # 🔥 ADD THIS IMPORT (ONLY NEW LINE)
 from fastapi_app.routes.auth import get_current_user
 from fastapi_app.routes.plan_guard import check_contract_limit
+from fastapi_app.routes.reputation import reputation_of
+from fastapi_app.routes.geo import get_country_code
+from fastapi_app.routes.downloads import ranged_file_response, work_zip_response, discard_work_archives
  
 router = APIRouter(prefix="/contracts", tags=["My Project"])
  
@@ -115,7 +115,7 @@ def get_contracts_by_status(
     # Base Query - include job details
     contracts = Contract.objects.filter(
         Q(creator=current_user) | Q(collaborator=current_user)
-    ).select_related("job", "creator", "collaborator")
+    ).select_related("job", "creator", "creator__reputation", "collaborator")
 
     # Filter by status
     if status.lower() == "accepted":
@@ -131,16 +131,9 @@ def get_contracts_by_status(
     for c in contracts:
         job = c.job
     
-        # ⭐ Rating + Reviews (job poster = creator)
-        review_stats = Review.objects.filter(
-            recipient=c.creator
-        ).aggregate(
-            avg_rating=Avg("rating"),
-            total_reviews=Count("id")
-        )
-    
-        rating = round(review_stats["avg_rating"] or 0, 1)
-        reviews = review_stats["total_reviews"]
+        # ⭐ Rating + Reviews (job poster = creator), from the joined reputation row
+        reputation = reputation_of(c.creator)
+        rating, reviews = reputation.rating, reputation.review_count
     
         # 📍 Location (FROM UserData)
         country = c.creator.location or "USA"
@@ -282,7 +275,8 @@ import mimetypes
 @router.get("/{id}/work-attachment")
 def download_work_attachment(
     id: int,
-    user_id: int
+    user_id: int,
+    request: Request
 ):
     try:
         contract = Contract.objects.get(id=id)
@@ -311,13 +305,12 @@ def download_work_attachment(
     content_type, _ = mimetypes.guess_type(file_path)
     content_type = content_type or "application/octet-stream"
 
-    return FileResponse(
-        path=file_path,
+    # Streamed in chunks; Range (resume / seek) and If-None-Match (304) aware
+    return ranged_file_response(
+        request,
+        file_path,
         media_type=content_type,
-        filename=filename,
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
+        content_disposition=f'attachment; filename="{filename}"'
     )
 # ==========================================================
 # 2. ACCEPT CONTRACT
@@ -426,6 +419,7 @@ def submit_work(
             raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
 
         contract.work_attachment.name = f"work_submissions/{filename}"
+        discard_work_archives(contract.id)  # prebuilt ZIP of the previous submission
 
     # ✅ CHANGE: Set to 'in_review' instead of 'completed'
     contract.status = "in_review"
@@ -475,10 +469,12 @@ def approve_work(id: int, user_id: int):
 # 5. ✅ NEW: DOWNLOAD WORK (ZIP Format)
 # ==========================================================
 @router.get("/{contract_id}/download-work")
-def download_work_zip(contract_id: int, user_id: int):
+def download_work_zip(contract_id: int, user_id: int, request: Request):
     """
     Downloads the submitted work attachment as a ZIP file.
     Allowed for: The Creator (Employer) OR The Collaborator (Freelancer).
+    The ZIP is streamed as it is built (already-compressed media is STORED)
+    and kept under MEDIA_ROOT/work_archives/ for later downloads.
     """
     try:
         # 1. Fetch contract
@@ -498,26 +494,16 @@ def download_work_zip(contract_id: int, user_id: int):
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="File not found on server.")
  
-        # 5. Create ZIP in Memory
-        file_name = os.path.basename(file_path)
-        zip_buffer = io.BytesIO()
- 
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            # Add the file to the zip archive
-            zip_file.write(file_path, arcname=file_name)
- 
-        # Reset buffer position to beginning
-        zip_buffer.seek(0)
- 
-        # 6. Return Streaming Response (Triggers Browser Download)
-        return StreamingResponse(
-            zip_buffer,
-            media_type="application/x-zip-compressed",
-            headers={
-                "Content-Disposition": f"attachment; filename=work_submission_{contract_id}.zip"
-            }
+        # 5. Stream the ZIP (or the cached archive) — triggers browser download
+        return work_zip_response(
+            request,
+            contract_id,
+            file_path,
+            filename=f"work_submission_{contract_id}.zip"
         )
  
+    except HTTPException:
+        raise
     except Contract.DoesNotExist:
         raise HTTPException(status_code=404, detail="Contract not found")
     except UserData.DoesNotExist:
@@ -578,31 +564,6 @@ def download_work_zip(contract_id: int, user_id: int):
 #     return {"message": "Contract is now in progress"}
 
 
-from django.db.models import Avg, Count
-from creator_app.models import Review
-from django.db.models import Sum
-import pycountry
-
-
-
-def get_country_code(country_name: str | None):
-    if not country_name:
-        return None
-    try:
-        country = pycountry.countries.search_fuzzy(country_name)[0]
-        return country.alpha_2
-    except Exception:
-        return None
-
-
-def get_total_earnings(user):
-    return (
-        Contract.objects
-        .filter(collaborator=user, status="completed")
-        .aggregate(total=Sum("budget"))["total"]
-        or 0
-    )
-
 def get_rate_display(profile):
     if not profile or not profile.pricing_amount:
         return None
@@ -650,7 +611,8 @@ def get_my_contracts(
         )
         .select_related(
             "collaborator",
-            "collaborator__collaboratorprofile"
+            "collaborator__collaboratorprofile",
+            "collaborator__reputation"
         )
     )
 
@@ -660,20 +622,13 @@ def get_my_contracts(
         collaborator = c.collaborator
         profile = getattr(collaborator, "collaboratorprofile", None)
 
-        review_stats = Review.objects.filter(
-            recipient=collaborator
-        ).aggregate(
-            avg_rating=Avg("rating"),
-            total_reviews=Count("id")
-        )
-
-        rating = round(review_stats["avg_rating"] or 0, 1)
-        reviews = review_stats["total_reviews"]
+        reputation = reputation_of(collaborator)
+        rating, reviews = reputation.rating, reputation.review_count
 
         country = collaborator.location or "Unknown"
         country_code = get_country_code(country)
 
-        total_earnings = get_total_earnings(collaborator)
+        total_earnings = reputation.contract_earnings
 
         result.append({
             "id": c.id,
@@ -6,15 +6,15 @@ from fastapi import APIRouter, File, Form, HTTPException, Path, Query, Request,
 from creator_app.models import Review, UserData, CreatorProfile
 from creator_app.models import UserData, CollaboratorProfile,JobPost, PortfolioItem
 from pathlib import Path as PathLib
+from django.conf import settings
 from asgiref.sync import sync_to_async
 import random
 import string
 from django.core.files.base import ContentFile
-import pycountry
-import pytz
-from django.db.models import Avg, Count
-from datetime import datetime
-from timezonefinder import TimezoneFinder
+from fastapi_app.routes.thumbnails import thumb_path
+from fastapi_app.routes.matching import engine as match_engine
+from fastapi_app.routes.reputation import get_reputation
+from fastapi_app.routes.geo import get_country_code, get_local_time_from_country
 
 
 router = APIRouter(prefix="/creator", tags=["Creator"])
@@ -183,45 +183,6 @@ async def save_creator_profile(
 # Get Creator Profile by USER ID
 # ------------------------------------------------
 
-tf = TimezoneFinder()
-
-def get_country_code(country_name: str | None):
-    if not country_name:
-        return None
-    try:
-        country = pycountry.countries.search_fuzzy(country_name)[0]
-        return country.alpha_2
-    except Exception:
-        return None
-
-
-def get_local_time_from_country(country_name: str | None):
-    """
-    Returns formatted local time like: 7:45 PM
-    """
-    if not country_name:
-        return None
-
-    try:
-        code = get_country_code(country_name)
-        if not code:
-            return None
-
-        # pycountry gives code, pytz gives list of timezones
-        timezones = pytz.country_timezones.get(code)
-        if not timezones:
-            return None
-
-        # pick first timezone
-        tz = pytz.timezone(timezones[0])
-        now = datetime.now(tz)
-
-        return now.strftime("%I:%M %p").lstrip("0")  # 07:45 PM -> 7:45 PM
-
-    except Exception:
-        return None
-
-
 # In your FastAPI router file
 @router.get("/get/{user_id}")
 def get_creator_profile(user_id: int, request : Request):
@@ -243,6 +204,10 @@ def get_creator_profile(user_id: int, request : Request):
             "first_name": user.first_name or "",
             "last_name": user.last_name or "",
             "profile_picture": request.base_url._url.rstrip("/") + user.profile_picture.url if user.profile_picture else None,
+            "thumb_url": (
+                request.base_url._url.rstrip("/") + settings.MEDIA_URL + thumb_path(user.profile_picture, "sm")
+                if user.profile_picture and thumb_path(user.profile_picture, "sm") else None
+            ),
             "state": user.state or "",
             "country_code": country_code,  
             "local_time": local_time, 
@@ -393,62 +358,33 @@ def edit_creator_profile(
 # BEST MATCH COLLABORATORS (For Creator Dashboard)
 # ------------------------------------------------
 @router.get("/collaborators/best-match/{user_id}")
-def get_best_match_collaborators(user_id: int):
+def get_best_match_collaborators(user_id: int, limit: int = Query(50, ge=1, le=200)):
     """
     Finds collaborators that match the skills required in the Creator's active Job Posts.
-    Ranked from Highest Match to Lowest Match.
+    Ranked from Highest Match to Lowest Match (TF-IDF cosine, match score 0-100).
     """
     try:
         user = UserData.objects.get(id=user_id)
  
-        # 1. Collect Skills from Creator's Active Job Posts
-        # We look at what the creator is hiring for RIGHT NOW.
-        active_jobs = JobPost.objects.filter(employer=user, status="posted")
-       
-        needed_skills = set() # Use a set to avoid duplicates
-       
-        for job in active_jobs:
-            # Add skills from the JSON list (e.g. ["Python", "React"])
-            if job.skills:
-                for skill in job.skills:
-                    needed_skills.add(skill.lower())
-           
-            # Also add the Job Title keywords (e.g. "UI/UX Designer")
-            if job.title:
-                needed_skills.add(job.title.lower())
+        # 1. Creator's Active Job Posts = what the creator is hiring for RIGHT NOW.
+        #    Their skills, titles and descriptions together form the query vector.
+        active_jobs = list(
+            JobPost.objects.filter(employer=user, status="posted").only("id", "title", "description", "skills")
+        )
  
         # If creator has no jobs, return empty or all collaborators (Decision: Empty for relevance)
-        if not needed_skills:
+        if not active_jobs:
             return []
  
-        # 2. Score Collaborators against these Skills
-        all_collaborators = CollaboratorProfile.objects.all()
-        scored_results = []
- 
-        for collab in all_collaborators:
-            score = 0
-            # Get collaborator's main skill category (e.g. "Frontend Developer")
-            collab_skill = (collab.skill_category or "").lower()
-           
-            # --- SCORING LOGIC ---
-            # Check if their category matches any of our needed skills
-            for req_skill in needed_skills:
-                if req_skill in collab_skill:
-                    score += 10 # Direct match
-                elif collab_skill in req_skill:
-                    score += 5  # Partial match
-           
-            # Only include if there is at least some match
-            if score > 0:
-                scored_results.append({
-                    "collaborator": collab,
-                    "score": score
-                })
- 
-        # 3. Sort by Score (Highest first)
-        scored_results.sort(key=lambda x: x["score"], reverse=True)
+        # 2. Top-k collaborator profiles from the in-memory matching engine
+        ranked = match_engine.profiles_for_jobs(active_jobs, k=limit)
+        profiles = CollaboratorProfile.objects.select_related("user").in_bulk([pid for pid, _ in ranked])
+        scored_results = [
+            {"collaborator": profiles[pid], "score": round(score * 100)}
+            for pid, score in ranked if pid in profiles
+        ]
  
-        # 4. Format the Output
+        # 3. Format the Output
         return [
             {
                 "user_id": item["collaborator"].user.id,
@@ -481,19 +417,11 @@ async def get_review_stats(user_id: int):
     except UserData.DoesNotExist:
         raise HTTPException(status_code=404, detail="User not found")
 
-    stats = await sync_to_async(
-        lambda: Review.objects.filter(recipient=user_id).aggregate(
-            avg_rating=Avg("rating"),
-            total_reviews=Count("id")
-        )
-    )()
-
-    avg_rating = round(stats["avg_rating"] or 0, 1)
-    total_reviews = stats["total_reviews"] or 0
+    reputation = await sync_to_async(get_reputation)(user.id)
 
     return {
-        "avg_rating": avg_rating,
-        "total_reviews": total_reviews
+        "avg_rating": reputation.rating,
+        "total_reviews": reputation.review_count
     }
 
 
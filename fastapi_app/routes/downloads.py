@@ -0,0 +1,211 @@
+import glob
+import os
+import uuid
+import zipfile
+
+from django.conf import settings
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", 256 * 1024))
+WORK_ARCHIVE_DIR = os.path.join(settings.MEDIA_ROOT, "work_archives")
+
+# Deflating these only burns CPU: they are compressed already
+STORED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".avif",
+    ".mp4", ".mov", ".m4v", ".mkv", ".webm", ".avi", ".wmv",
+    ".mp3", ".aac", ".m4a", ".ogg", ".opus", ".flac",
+    ".zip", ".rar", ".7z", ".gz", ".tgz", ".bz2", ".xz",
+    ".docx", ".xlsx", ".pptx", ".pdf",
+}
+
+
+# =========================================================
+# 🔹 ETAG / RANGE HELPERS
+# =========================================================
+def file_etag(st: os.stat_result) -> str:
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """ If-None-Match uses weak comparison: W/"x" matches "x". """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def parse_range(header: str | None, size: int):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to serve the
+    whole file (no header, multiple ranges, or syntax we don't handle).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, _, end = header[6:].strip().partition("-")
+    try:
+        if not start:                      # bytes=-500 → last 500 bytes
+            length = int(end)
+            if length <= 0:
+                raise ValueError
+            return max(size - length, 0), size - 1
+        first = int(start)
+        last = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if first >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    if first > last:
+        return None
+    return first, min(last, size - 1)
+
+
+def iter_file_range(path: str, start: int, end: int):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = fh.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def ranged_file_response(request: Request, path: str, media_type: str, content_disposition: str, etag: str | None = None):
+    """
+    Streams `path` in chunks with ETag / If-None-Match (304) and single
+    Range / If-Range (206) support.
+    """
+    st = os.stat(path)
+    etag = etag or file_etag(st)
+    headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = content_disposition
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == etag:
+        byte_range = parse_range(request.headers.get("range"), st.st_size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(st.st_size)
+        return StreamingResponse(iter_file_range(path, 0, st.st_size - 1), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{st.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(iter_file_range(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+
+# =========================================================
+# 🔹 STREAMING ZIP
+# =========================================================
+def zip_compression(path: str) -> int:
+    ext = os.path.splitext(path)[1].lower()
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class _ZipSink:
+    """
+    Write-only file object for ZipFile. It has no tell/seek, so zipfile
+    writes data descriptors and never goes back; whatever it wrote is
+    handed out by drain() (and copied to `tee`, if given).
+    """
+
+    def __init__(self, tee=None):
+        self.chunks = []
+        self.tee = tee
+
+    def write(self, data):
+        if data:
+            self.chunks.append(bytes(data))
+            if self.tee is not None:
+                self.tee.write(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self.chunks)
+        self.chunks.clear()
+        return out
+
+
+def iter_zip(path: str, arcname: str, tee=None):
+    """ A one-file ZIP of `path`, generated chunk by chunk. """
+    sink = _ZipSink(tee)
+    with zipfile.ZipFile(sink, "w") as zf:
+        info = zipfile.ZipInfo.from_file(path, arcname)
+        info.compress_type = zip_compression(path)
+        with open(path, "rb") as src, zf.open(info, "w", force_zip64=True) as dest:
+            while chunk := src.read(DOWNLOAD_CHUNK_SIZE):
+                dest.write(chunk)
+                out = sink.drain()
+                if out:
+                    yield out
+    yield sink.drain()
+
+
+def iter_zip_cached(path: str, arcname: str, cache_path: str):
+    """
+    Streams the ZIP while writing it to `cache_path`; the file only appears
+    (atomically) once the whole archive was produced, so an aborted
+    download leaves nothing behind.
+    """
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+    finished = False
+    try:
+        with open(tmp_path, "wb") as fh:
+            yield from iter_zip(path, arcname, tee=fh)
+        os.replace(tmp_path, cache_path)
+        finished = True
+    finally:
+        if not finished and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def work_archive_path(contract_id: int, st: os.stat_result) -> str:
+    """ Cached archive of a submission, keyed by the attachment's size + mtime. """
+    return os.path.join(WORK_ARCHIVE_DIR, f"{contract_id}-{st.st_size:x}-{st.st_mtime_ns:x}.zip")
+
+
+def discard_work_archives(contract_id: int, keep: str | None = None):
+    for old in glob.glob(os.path.join(WORK_ARCHIVE_DIR, f"{contract_id}-*.zip")):
+        if old != keep:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def work_zip_response(request: Request, contract_id: int, path: str, filename: str):
+    """
+    Prebuilt archive → ranged file response. Otherwise the ZIP is streamed
+    on the fly (no Content-Length yet) and cached for the next download.
+    """
+    st = os.stat(path)
+    etag = f'"zip-{st.st_size:x}-{st.st_mtime_ns:x}"'
+    content_disposition = f"attachment; filename={filename}"
+    cache_path = work_archive_path(contract_id, st)
+
+    if os.path.exists(cache_path):
+        return ranged_file_response(request, cache_path, "application/x-zip-compressed", content_disposition, etag)
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    os.makedirs(WORK_ARCHIVE_DIR, exist_ok=True)
+    discard_work_archives(contract_id, keep=cache_path)
+    return StreamingResponse(
+        iter_zip_cached(path, os.path.basename(path), cache_path),
+        media_type="application/x-zip-compressed",
+        headers={"ETag": etag, "Content-Disposition": content_disposition}
+    )
@@ -0,0 +1,177 @@
+import fastapi_app.django_setup
+
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from creator_app.models import (
+    ExportJob,
+    UserData,
+    WalletTransaction,
+    BillingHistory,
+    Contract
+)
+from fastapi_app.routes.exports import EXPORT_CHUNK_SIZE, iter_csv, iter_keyset, write_xlsx
+
+EXPORT_DIR = "exports"
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("EXPORT_WORKERS", 1)),
+    thread_name_prefix="exports"
+)
+
+
+# =========================================================
+# 🔹 DATASETS
+# =========================================================
+def _fmt_date(value):
+    return value.strftime("%Y-%m-%d") if value else "N/A"
+
+
+def _full_name(u):
+    return f"{u.first_name} {u.last_name}".strip() if u else ""
+
+
+def user_export_row(u):
+    return [_full_name(u), u.email, u.role, getattr(u, 'status', 'Active'), _fmt_date(u.created_at)]
+
+
+def transaction_export_row(t):
+    return [t.id, t.user.email if t.user else "", t.transaction_type, float(t.amount), _fmt_date(t.created_at)]
+
+
+def billing_export_row(b):
+    return [b.invoice_id or "", b.user.email, b.plan_name, b.duration or "", float(b.amount),
+            b.payment_method or "", b.status, _fmt_date(b.paid_on)]
+
+
+def contract_export_row(c):
+    return [c.id, c.job.title, _full_name(c.creator), _full_name(c.collaborator), float(c.budget),
+            c.status, _fmt_date(c.start_date), _fmt_date(c.end_date), _fmt_date(c.updated_at)]
+
+
+EXPORT_DATASETS = {
+    "users": {
+        "title": "Users List",
+        "queryset": lambda: UserData.objects.only("first_name", "last_name", "email", "role", "status", "created_at"),
+        "date_field": "created_at",
+        "status_field": "status",
+        "headers": ["Full Name", "Email", "Role", "Status", "Joined Date"],
+        "widths": [28, 36, 16, 12, 14],
+        "row": user_export_row,
+    },
+    "transactions": {
+        "title": "Wallet Transactions",
+        "queryset": lambda: WalletTransaction.objects.select_related("user"),
+        "date_field": "created_at",
+        "status_field": "transaction_type",
+        "headers": ["ID", "User Email", "Type", "Amount", "Date"],
+        "widths": [10, 36, 24, 14, 14],
+        "row": transaction_export_row,
+    },
+    "billing": {
+        "title": "Billing History",
+        "queryset": lambda: BillingHistory.objects.select_related("user"),
+        "date_field": "paid_on",
+        "status_field": "status",
+        "headers": ["Invoice ID", "User Email", "Plan", "Duration", "Amount", "Payment Method", "Status", "Paid On"],
+        "widths": [24, 36, 14, 12, 12, 16, 12, 14],
+        "row": billing_export_row,
+    },
+    "contracts": {
+        "title": "Contracts",
+        "queryset": lambda: Contract.objects.select_related("job", "creator", "collaborator"),
+        "date_field": "updated_at",
+        "status_field": "status",
+        "headers": ["ID", "Job", "Creator", "Collaborator", "Budget", "Status", "Start Date", "End Date", "Updated"],
+        "widths": [10, 40, 28, 28, 12, 14, 14, 14, 14],
+        "row": contract_export_row,
+    },
+}
+
+
+def build_export_queryset(dataset: str, filters: dict):
+    """ Dataset queryset with the admin filters applied (from_date/to_date/status/role/search). """
+    spec = EXPORT_DATASETS[dataset]
+    query = spec["queryset"]()
+    date_field = spec["date_field"]
+
+    if filters.get("from_date"):
+        query = query.filter(**{f"{date_field}__date__gte": date.fromisoformat(filters["from_date"])})
+    if filters.get("to_date"):
+        query = query.filter(**{f"{date_field}__date__lte": date.fromisoformat(filters["to_date"])})
+    if filters.get("status"):
+        query = query.filter(**{f"{spec['status_field']}__iexact": filters["status"]})
+
+    if dataset == "users":
+        if filters.get("role"):
+            query = query.filter(role__iexact=filters["role"])
+        if filters.get("search"):
+            query = query.filter(Q(first_name__icontains=filters["search"]) | Q(email__icontains=filters["search"]))
+    return query
+
+
+# =========================================================
+# 🔹 WORKER
+# =========================================================
+def _tracked_rows(job, query, row_fn):
+    """ Yields export rows while persisting progress once per chunk. """
+    processed = 0
+    for obj in iter_keyset(query, "id", EXPORT_CHUNK_SIZE):
+        yield row_fn(obj)
+        processed += 1
+        if processed % EXPORT_CHUNK_SIZE == 0:
+            ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed)
+    job.processed_rows = processed
+
+
+def run_export_job(job_id: int):
+    tmp = None
+    try:
+        job = ExportJob.objects.get(pk=job_id)
+        spec = EXPORT_DATASETS[job.dataset]
+        query = build_export_queryset(job.dataset, job.filters or {})
+
+        job.status = "running"
+        job.total_rows = query.count()
+        job.save(update_fields=["status", "total_rows"])
+
+        ext = "csv" if job.format == "csv" else "xlsx"
+        relative = f"{EXPORT_DIR}/{job.dataset}_export_{job.id}_{timezone.now().strftime('%Y%m%d%H%M%S')}.{ext}"
+        target = os.path.join(settings.PRIVATE_MEDIA_ROOT, relative)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.tmp"
+
+        rows = _tracked_rows(job, query, spec["row"])
+        if job.format == "csv":
+            with open(tmp, "wb") as out:
+                for line in iter_csv(spec["headers"], rows):
+                    out.write(line)
+        else:
+            write_xlsx(tmp, spec["title"], spec["headers"], rows, widths=spec["widths"])
+        os.replace(tmp, target)
+
+        job.file.name = relative
+        job.status = "done"
+        job.finished_at = timezone.now()
+        job.save(update_fields=["file", "status", "processed_rows", "finished_at"])
+
+    except Exception as e:
+        print(f"❌ Export job {job_id} failed:", e)
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+        ExportJob.objects.filter(pk=job_id).update(
+            status="failed", error=traceback.format_exc()[-2000:], finished_at=timezone.now()
+        )
+    finally:
+        close_old_connections()
+
+
+def enqueue_export(job: ExportJob):
+    _executor.submit(run_export_job, job.id)
@@ -0,0 +1,120 @@
+import csv
+import os
+import tempfile
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))   # rows per DB round-trip
+EXPORT_READ_SIZE = 64 * 1024                                      # bytes per streamed piece
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="2e1065", end_color="2e1065", fill_type="solid")
+
+
+# =========================================================
+# 🔹 KEYSET CHUNKING (bounded memory on MySQL)
+# =========================================================
+def iter_keyset(query, key="pk", chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Newest-first walk of `query` in chunks keyed on the unique field `key`.
+    Unlike .iterator(), each chunk is its own short query, so MySQL (no
+    server-side cursors) never buffers the whole result set.
+    """
+    query = query.order_by(f"-{key}")
+    last = None
+    while True:
+        chunk = query if last is None else query.filter(**{f"{key}__lt": last})
+        batch = list(chunk[:chunk_size])
+        if not batch:
+            break
+        yield from batch
+        last = getattr(batch[-1], key)
+        if len(batch) < chunk_size:
+            break
+
+
+# =========================================================
+# 🔹 CSV (row by row)
+# =========================================================
+class _Echo:
+    """ File-like object whose write() just hands the line back to csv.writer's caller. """
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    """ Yields encoded CSV lines as `rows` is consumed — nothing is buffered. """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers).encode("utf-8")
+    for row in rows:
+        yield writer.writerow(row).encode("utf-8")
+
+
+# =========================================================
+# 🔹 XLSX (openpyxl write-only mode)
+# =========================================================
+def write_xlsx(target, title, headers, rows, widths=None):
+    """
+    Writes rows into `target` (path or binary file) with a write-only workbook,
+    so rows are flushed to disk as they are appended instead of kept in memory.
+    Column widths are fixed up front — write-only sheets can't be auto-sized.
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=title)
+
+    for i, width in enumerate(widths or []):
+        ws.column_dimensions[get_column_letter(i + 1)].width = width
+
+    header_cells = []
+    for value in headers:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    count = 0
+    for row in rows:
+        ws.append(row)
+        count += 1
+
+    wb.save(target)
+    return count
+
+
+def iter_file(fh, close=True):
+    """ Streams an open binary file in EXPORT_READ_SIZE pieces. """
+    try:
+        fh.seek(0)
+        while True:
+            chunk = fh.read(EXPORT_READ_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if close:
+            fh.close()
+
+
+def iter_xlsx(title, headers, rows, widths=None):
+    """
+    Writes the whole workbook to an anonymous temp file, then streams it out.
+    An XLSX is a zip whose directory comes last, so nothing can be sent until
+    the workbook is closed — memory stays flat, but time-to-first-byte grows
+    with the row count; very large reports belong in the export jobs.
+    """
+    fh = tempfile.TemporaryFile()
+    try:
+        write_xlsx(fh, title, headers, rows, widths)
+    except BaseException:
+        fh.close()
+        raise
+    return iter_file(fh)
@@ -0,0 +1,96 @@
+import threading
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+
+import pycountry
+import pytz
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+# Spellings users type into "location" that pycountry doesn't know as names
+COUNTRY_ALIASES = {
+    "usa": "US", "u.s.": "US", "u.s.a.": "US", "us": "US", "america": "US", "united states of america": "US",
+    "uk": "GB", "u.k.": "GB", "england": "GB", "scotland": "GB", "wales": "GB", "great britain": "GB", "britain": "GB",
+    "uae": "AE", "russia": "RU", "south korea": "KR", "korea": "KR", "north korea": "KP",
+    "vietnam": "VN", "iran": "IR", "syria": "SY", "laos": "LA", "bolivia": "BO", "venezuela": "VE",
+    "tanzania": "TZ", "moldova": "MD", "taiwan": "TW", "czech republic": "CZ", "turkey": "TR",
+}
+
+
+def normalize_place(value) -> str:
+    """ "  Côte d'Ivoire " → "cote d'ivoire" """
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+# =========================================================
+# 🔹 PRECOMPUTED TABLES (built lazily, once per process)
+# =========================================================
+_tables = None
+_tables_lock = threading.Lock()
+
+
+def _build_tables():
+    """ ({normalized name / alias / code: alpha-2}, {alpha-2: first pytz timezone}) """
+    names = {}
+    # Subdivisions first so that country names and codes win on collisions
+    # ("Georgia"), mirroring search_fuzzy's preference for countries.
+    for sub in pycountry.subdivisions:
+        names.setdefault(normalize_place(sub.name), sub.country_code)
+    for country in pycountry.countries:
+        for attr in ("name", "official_name", "common_name", "alpha_2", "alpha_3"):
+            value = getattr(country, attr, None)
+            if value:
+                names[normalize_place(value)] = country.alpha_2
+    names.update(COUNTRY_ALIASES)
+
+    timezones = {code: zones[0] for code, zones in pytz.country_timezones.items() if zones}
+    return names, timezones
+
+
+def _get_tables():
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                _tables = _build_tables()
+    return _tables
+
+
+# =========================================================
+# 🔹 RESOLVERS
+# =========================================================
+@lru_cache(maxsize=4096)
+def get_country_code(country_name: str | None):
+    """ Upper-case alpha-2 code for a free-text country name, or None. """
+    key = normalize_place(country_name)
+    if not key:
+        return None
+    code = _get_tables()[0].get(key)
+    if code:
+        return code
+    # Misspellings / partial names: fall back to the (slow) fuzzy search, cached per name
+    try:
+        return pycountry.countries.search_fuzzy(key)[0].alpha_2
+    except LookupError:
+        return None
+
+
+@lru_cache(maxsize=512)
+def get_country_timezone(country_code: str | None):
+    """ pytz timezone of a country (its first listed zone), or None. """
+    zone = _get_tables()[1].get((country_code or "").upper())
+    return pytz.timezone(zone) if zone else None
+
+
+def get_local_time_from_country(country_name: str | None):
+    """
+    Returns formatted local time like: 7:45 PM
+    """
+    tz = get_country_timezone(get_country_code(country_name))
+    if tz is None:
+        return None
+    return datetime.now(tz).strftime("%I:%M %p").lstrip("0")  # 07:45 PM -> 7:45 PM
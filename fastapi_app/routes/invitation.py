@@ -1,6 +1,7 @@
 import fastapi_app.django_setup
 
 from fastapi import APIRouter, Form, HTTPException
+from django.db import transaction
 from creator_app.models import Invitation, UserData, Contract, JobPost
 
 # ✅ FIXED IMPORT (THIS IS THE REAL ISSUE)
@@ -25,18 +26,19 @@ def create_invitation(
         receiver = UserData.objects.get(id=receiver_id)
         job = JobPost.objects.get(id=job_id)
 
-        # 🔒 PLAN CHECK – INVITE LIMIT
-        check_invite_limit(sender)
-
-        invitation = Invitation.objects.create(
-            sender=sender,
-            receiver=receiver,
-            job=job,
-            client_name=client_name,
-            project_name=project_name,
-            date=date,
-            revenue=revenue
-        )
+        with transaction.atomic():
+            # 🔒 PLAN CHECK – INVITE LIMIT (same transaction as the insert)
+            check_invite_limit(sender)
+
+            invitation = Invitation.objects.create(
+                sender=sender,
+                receiver=receiver,
+                job=job,
+                client_name=client_name,
+                project_name=project_name,
+                date=date,
+                revenue=revenue
+            )
 
         return {
             "message": "Invitation created",
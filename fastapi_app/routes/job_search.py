@@ -0,0 +1,207 @@
+import fastapi_app.django_setup
+
+import bisect
+import heapq
+import math
+import os
+import threading
+from collections import Counter
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from creator_app.models import CreatorProfile, JobPost
+from fastapi_app.routes.skill_index import split_words, as_skill_list
+from fastapi_app.routes.lazy_index import InvalidatedIndex
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+JOB_SEARCH_REBUILD_SECONDS = int(os.getenv("JOB_SEARCH_REBUILD_SECONDS", 600))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+FIELD_WEIGHTS = {
+    "title": 3,
+    "skills": 2,
+    "creator_name": 2,
+    "location": 1,
+    "description": 1,
+}
+
+# Query words that aren't indexed terms also match terms they prefix
+# ("dev" → "developer", "devops"), at a discount and capped.
+PREFIX_EXPANSIONS = 20
+PREFIX_DISCOUNT = 0.5
+
+
+def job_fields(job) -> dict:
+    cp = getattr(job.employer, "creatorprofile", None)
+    return {
+        "title": job.title,
+        "skills": " ".join(as_skill_list(job.skills)),
+        "creator_name": cp.creator_name if cp else "",
+        "location": cp.location if cp else "",
+        "description": job.description,
+    }
+
+
+def job_term_frequencies(job) -> Counter:
+    tf = Counter()
+    for field, text in job_fields(job).items():
+        for word in split_words(text):
+            tf[word] += FIELD_WEIGHTS[field]
+    return tf
+
+
+# =========================================================
+# 🔹 BM25 INVERTED INDEX
+# =========================================================
+class BM25Index:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}     # term -> {doc_id: weighted tf}
+        self.doc_terms = {}    # doc_id -> Counter
+        self.doc_len = {}      # doc_id -> weighted length
+        self.total_len = 0
+        self.vocab = []        # sorted terms, for prefix expansion
+        self.vocab_dirty = False
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def upsert(self, doc_id, tf: Counter):
+        with self.lock:
+            self._remove(doc_id)
+            if not tf:
+                return
+            self.doc_terms[doc_id] = tf
+            length = sum(tf.values())
+            self.doc_len[doc_id] = length
+            self.total_len += length
+            for term, freq in tf.items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = self.postings[term] = {}
+                    self.vocab_dirty = True
+                posting[doc_id] = freq
+
+    def remove(self, doc_id):
+        with self.lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        tf = self.doc_terms.pop(doc_id, None)
+        if tf is None:
+            return
+        self.total_len -= self.doc_len.pop(doc_id, 0)
+        for term in tf:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+                    self.vocab_dirty = True
+
+    def _query_terms(self, text):
+        """ {term: query weight}, with prefix expansion for unknown words. """
+        if self.vocab_dirty:
+            self.vocab = sorted(self.postings)
+            self.vocab_dirty = False
+
+        weights = {}
+        for word in split_words(text):
+            if word in self.postings:
+                weights[word] = max(weights.get(word, 0), 1.0)
+                continue
+            start = bisect.bisect_left(self.vocab, word)
+            for term in self.vocab[start:start + PREFIX_EXPANSIONS]:
+                if not term.startswith(word):
+                    break
+                weights[term] = max(weights.get(term, 0), PREFIX_DISCOUNT)
+        return weights
+
+    def search(self, text, k=50, after=None):
+        """
+        [(doc_id, score)] best first (score desc, id desc), scores rounded
+        to 6 places so `after=(score, id)` from a previous page is exact.
+        """
+        with self.lock:
+            n_docs = len(self.doc_terms)
+            if not n_docs:
+                return []
+            avgdl = self.total_len / n_docs
+
+            scores = {}
+            for term, q_weight in self._query_terms(text).items():
+                posting = self.postings[term]
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, freq in posting.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[doc_id] / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + q_weight * idf * freq * (BM25_K1 + 1) / (freq + norm)
+
+        ranked = ((round(score, 6), doc_id) for doc_id, score in scores.items())
+        if after is not None:
+            ranked = (item for item in ranked if item < after)
+        return [(doc_id, score) for score, doc_id in heapq.nlargest(k, ranked)]
+
+
+# =========================================================
+# 🔹 POSTED-JOB INDEX (lazy build + signals)
+# =========================================================
+def _posted_jobs():
+    return JobPost.objects.filter(status__iexact="posted").select_related("employer", "employer__creatorprofile")
+
+
+def build_job_index():
+    index = BM25Index()
+    for job in _posted_jobs().iterator(chunk_size=2000):
+        index.upsert(job.id, job_term_frequencies(job))
+    return index
+
+
+class JobSearchIndex:
+    def __init__(self):
+        self.index = InvalidatedIndex(build_job_index, JOB_SEARCH_REBUILD_SECONDS)
+
+    def search(self, text, k=50, after=None):
+        return self.index.get().search(text, k, after)
+
+    def job_changed(self, job):
+        if (job.status or "").lower() == "posted":
+            self.index.apply(lambda ix: ix.upsert(job.id, job_term_frequencies(job)))
+        else:
+            self.job_removed(job.id)
+
+    def job_removed(self, job_id):
+        self.index.apply(lambda ix: ix.remove(job_id))
+
+    def creator_changed(self, user_id):
+        """ Creator name/location are indexed on every posted job of that creator. """
+        if not self.index.accepts_updates():
+            return
+        jobs = list(_posted_jobs().filter(employer_id=user_id))
+
+        def reindex(ix):
+            for job in jobs:
+                ix.upsert(job.id, job_term_frequencies(job))
+        self.index.apply(reindex)
+
+
+job_index = JobSearchIndex()
+
+
+@receiver(post_save, sender=JobPost)
+def job_search_job_saved(sender, instance, **kwargs):
+    job_index.job_changed(instance)
+
+
+@receiver(post_delete, sender=JobPost)
+def job_search_job_deleted(sender, instance, **kwargs):
+    job_index.job_removed(instance.id)
+
+
+@receiver(post_save, sender=CreatorProfile)
+def job_search_creator_saved(sender, instance, **kwargs):
+    job_index.creator_changed(instance.user_id)
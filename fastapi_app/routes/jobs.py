@@ -5,6 +5,7 @@ import os
 import re
 
 from django.conf import settings
+from django.db import transaction
 from creator_app.models import JobPost, UserData
 
 # 🔒 PLAN GUARD
@@ -61,29 +62,30 @@ def create_job(
     try:
         employer = UserData.objects.get(id=employer_id)
 
-        # 🔒 PLAN LIMIT CHECK (THIS IS THE ONLY ADDITION)
-        check_job_limit(employer)
-
         # Parse skills
         skills_list = [s.strip() for s in skills.split(",") if s.strip()]
 
         # Auto timeline
         auto_timeline = calculate_timeline(duration)
 
-        # Create job
-        job = JobPost.objects.create(
-            employer=employer,
-            title=title,
-            description=description,
-            skills=skills_list,
-            timeline=auto_timeline,
-            duration=duration,
-            expertise_level=expertise_level,
-            budget_type=budget_type,
-            budget_from=budget_from,
-            budget_to=budget_to,
-            status=status.lower(),
-        )
+        with transaction.atomic():
+            # 🔒 PLAN LIMIT CHECK (same transaction as the insert)
+            check_job_limit(employer)
+
+            # Create job
+            job = JobPost.objects.create(
+                employer=employer,
+                title=title,
+                description=description,
+                skills=skills_list,
+                timeline=auto_timeline,
+                duration=duration,
+                expertise_level=expertise_level,
+                budget_type=budget_type,
+                budget_from=budget_from,
+                budget_to=budget_to,
+                status=status.lower(),
+            )
 
         # Save attachments
         if attachments:
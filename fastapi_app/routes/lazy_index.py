@@ -0,0 +1,116 @@
+import threading
+import time
+
+from django.db import connection
+
+# Back-off after a failed background rebuild (the current index keeps serving)
+REBUILD_RETRY_SECONDS = 30
+
+
+# =========================================================
+# 🔹 LAZY, PER-PROCESS IN-MEMORY INDEX
+# =========================================================
+class InvalidatedIndex:
+    """
+    Holds an in-memory index that `builder()` creates from the database.
+
+    - Built on first use, never at import. Only that first build blocks
+      the requests waiting for it.
+    - Rebuilt once `rebuild_seconds` have passed, which is how each worker
+      picks up writes made by the other workers, or after invalidate().
+      Rebuilds run in a background thread; reads keep getting the current
+      index until the new one is swapped in.
+    - This process's own writes are applied incrementally with apply(), from
+      the model signals. Writes that arrive while a build is running are
+      also replayed onto the new index before it is swapped in, so none are
+      lost to the rebuild's older snapshot.
+
+    apply() and the swap run under `lock`; the builder itself doesn't hold
+    it, and reads never take it.
+    """
+
+    def __init__(self, builder, rebuild_seconds: int):
+        self.builder = builder
+        self.rebuild_seconds = rebuild_seconds
+        self.lock = threading.RLock()
+        self.build_lock = threading.Lock()   # one build at a time
+        self.value = None
+        self.built_at = None
+        self.dirty = False
+        self.retry_at = 0
+        self._pending = None                 # updates seen while a build runs
+
+    def _stale(self) -> bool:
+        now = time.monotonic()
+        return now >= self.retry_at and (self.dirty or now - self.built_at >= self.rebuild_seconds)
+
+    def get(self):
+        """ The current index; the first call builds it, later ones may start a background rebuild. """
+        value = self.value
+        if value is None:
+            with self.build_lock:
+                if self.value is None:
+                    self._build()
+                return self.value
+        if self._stale() and self.build_lock.acquire(blocking=False):
+            threading.Thread(target=self._rebuild, name="index-rebuild", daemon=True).start()
+        return value
+
+    def _build(self):
+        """ Runs the builder (caller holds build_lock) and swaps the result in. """
+        with self.lock:
+            self._pending = []
+            self.dirty = False          # an invalidate() from here on triggers another rebuild
+        try:
+            value = self.builder()
+        except BaseException:
+            with self.lock:
+                self._pending = None
+                self.dirty = self.value is not None
+            raise
+
+        with self.lock:
+            for update in self._pending:
+                self._run(update, value)
+            self._pending = None
+            self.value = value
+            self.built_at = time.monotonic()
+
+    def _rebuild(self):
+        try:
+            self._build()
+        except Exception as e:
+            print("❌ index rebuild failed, keeping the current one:", e)
+            self.retry_at = time.monotonic() + REBUILD_RETRY_SECONDS
+        finally:
+            self.build_lock.release()
+            connection.close()   # this thread's own DB connection
+
+    def invalidate(self):
+        """ Rebuild (in the background) on the next read. """
+        self.dirty = True
+
+    def accepts_updates(self) -> bool:
+        """ Whether apply() would do anything (an index exists or is being built). """
+        return self.value is not None or self._pending is not None
+
+    def apply(self, update):
+        """
+        Runs `update(index)` for a local write. A failed update marks the
+        index dirty (rebuilt on the next read) rather than failing the write
+        that triggered it.
+        """
+        if not self.accepts_updates():
+            return
+        with self.lock:
+            if self._pending is not None:
+                self._pending.append(update)
+            if self.value is not None:
+                self._run(update, self.value)
+
+    def _run(self, update, value):
+        try:
+            update(value)
+        except Exception as e:
+            print("❌ index update failed, rebuilding on next read:", e)
+            self.invalidate()
@@ -0,0 +1,208 @@
+import fastapi_app.django_setup
+
+import heapq
+import math
+import os
+import threading
+from collections import Counter
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from creator_app.models import CollaboratorProfile, JobPost
+from fastapi_app.routes.skill_index import normalize_term, split_words, as_skill_list
+from fastapi_app.routes.lazy_index import InvalidatedIndex
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+# Each worker keeps its own copy, updated by this process's signals;
+# a periodic rebuild picks up writes made by other workers.
+MATCH_INDEX_REBUILD_SECONDS = int(os.getenv("MATCH_INDEX_REBUILD_SECONDS", 600))
+
+# Field weights of the bag-of-skills vectors
+SKILL_WEIGHT = 3.0     # whole skill / category phrase ("ui/ux design")
+TITLE_WEIGHT = 2.0     # words of a job title / skill category
+WORD_WEIGHT = 1.0      # words of skills and descriptions
+
+
+# =========================================================
+# 🔹 SPARSE TF-IDF INDEX (lnc.ltc cosine)
+# =========================================================
+class SparseTfidfIndex:
+    """
+    Documents are stored as log-tf vectors normalized to unit length (no idf),
+    queries get log-tf * idf — the SMART lnc.ltc scheme — so adding or
+    removing a document never requires re-weighting the others.
+
+    Scoring walks only the postings of the query's terms (a sparse dot
+    product) and keeps the best k with a heap.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.postings = {}   # term -> {doc_id: weight}
+        self.docs = {}       # doc_id -> {term: weight}
+
+    def __len__(self):
+        return len(self.docs)
+
+    @staticmethod
+    def _unit_vector(term_counts):
+        vector = {t: 1 + math.log(c) for t, c in term_counts.items() if c > 0}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {t: w / norm for t, w in vector.items()} if norm else {}
+
+    def upsert(self, doc_id, term_counts):
+        vector = self._unit_vector(term_counts)
+        with self.lock:
+            self._remove(doc_id)
+            if not vector:
+                return
+            self.docs[doc_id] = vector
+            for term, weight in vector.items():
+                self.postings.setdefault(term, {})[doc_id] = weight
+
+    def remove(self, doc_id):
+        with self.lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        for term in self.docs.pop(doc_id, {}):
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self.postings[term]
+
+    def top_k(self, term_counts, k=50, exclude=()):
+        """ [(doc_id, cosine)] best first. """
+        with self.lock:
+            total = len(self.docs)
+            if not total:
+                return []
+
+            query = {}
+            for term, count in term_counts.items():
+                posting = self.postings.get(term)
+                if count > 0 and posting:
+                    query[term] = (1 + math.log(count)) * math.log(1 + total / len(posting))
+            norm = math.sqrt(sum(w * w for w in query.values()))
+            if not norm:
+                return []
+
+            scores = {}
+            for term, q_weight in query.items():
+                q_weight /= norm
+                for doc_id, d_weight in self.postings[term].items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + q_weight * d_weight
+
+        for doc_id in exclude:
+            scores.pop(doc_id, None)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+# =========================================================
+# 🔹 FEATURES (bag of skills)
+# =========================================================
+def _add_phrases(counts, phrases, weight):
+    for phrase in phrases:
+        term = normalize_term(phrase)
+        if term:
+            counts[term] += weight
+
+
+def _add_words(counts, text, weight):
+    for word in split_words(text):
+        counts[word] += weight
+
+
+def job_terms(job) -> Counter:
+    counts = Counter()
+    skills = as_skill_list(job.skills)
+    _add_phrases(counts, skills, SKILL_WEIGHT)
+    for skill in skills:
+        _add_words(counts, skill, WORD_WEIGHT)
+    _add_words(counts, job.title, TITLE_WEIGHT)
+    _add_words(counts, job.description, WORD_WEIGHT)
+    return counts
+
+
+def profile_terms(profile) -> Counter:
+    counts = Counter()
+    skills = as_skill_list(profile.skills)
+    _add_phrases(counts, [profile.skill_category] + skills, SKILL_WEIGHT)
+    _add_words(counts, profile.skill_category, TITLE_WEIGHT)
+    for skill in skills:
+        _add_words(counts, skill, WORD_WEIGHT)
+    return counts
+
+
+# =========================================================
+# 🔹 ENGINE (posted jobs + collaborator profiles)
+# =========================================================
+class MatchingEngine:
+    def __init__(self):
+        # {"jobs": posted job id -> vector, "profiles": collaborator profile id -> vector}
+        self.indexes = InvalidatedIndex(self.build, MATCH_INDEX_REBUILD_SECONDS)
+
+    @staticmethod
+    def build():
+        jobs = SparseTfidfIndex()
+        for job in JobPost.objects.filter(status__iexact="posted").only("id", "title", "description", "skills").iterator(chunk_size=2000):
+            jobs.upsert(job.id, job_terms(job))
+
+        profiles = SparseTfidfIndex()
+        for profile in CollaboratorProfile.objects.only("id", "skill_category", "skills").iterator(chunk_size=2000):
+            profiles.upsert(profile.id, profile_terms(profile))
+
+        return {"jobs": jobs, "profiles": profiles}
+
+    # ---- incremental updates (signals) ----
+    def job_changed(self, job):
+        if (job.status or "").lower() == "posted":
+            self.indexes.apply(lambda ix: ix["jobs"].upsert(job.id, job_terms(job)))
+        else:
+            self.job_removed(job.id)
+
+    def job_removed(self, job_id):
+        self.indexes.apply(lambda ix: ix["jobs"].remove(job_id))
+
+    def profile_changed(self, profile):
+        self.indexes.apply(lambda ix: ix["profiles"].upsert(profile.id, profile_terms(profile)))
+
+    def profile_removed(self, profile_id):
+        self.indexes.apply(lambda ix: ix["profiles"].remove(profile_id))
+
+    # ---- queries ----
+    def jobs_for_profile(self, profile, k=50):
+        return self.indexes.get()["jobs"].top_k(profile_terms(profile), k)
+
+    def profiles_for_jobs(self, jobs, k=50):
+        query = Counter()
+        for job in jobs:
+            query.update(job_terms(job))
+        return self.indexes.get()["profiles"].top_k(query, k)
+
+
+engine = MatchingEngine()
+
+
+@receiver(post_save, sender=JobPost)
+def job_post_saved(sender, instance, **kwargs):
+    engine.job_changed(instance)
+
+
+@receiver(post_delete, sender=JobPost)
+def job_post_deleted(sender, instance, **kwargs):
+    engine.job_removed(instance.id)
+
+
+@receiver(post_save, sender=CollaboratorProfile)
+def collaborator_profile_saved(sender, instance, **kwargs):
+    engine.profile_changed(instance)
+
+
+@receiver(post_delete, sender=CollaboratorProfile)
+def collaborator_profile_deleted(sender, instance, **kwargs):
+    engine.profile_removed(instance.id)
@@ -1,13 +1,19 @@
 from fastapi_app.django_setup import setup_django
 setup_django()
 
-from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Request, Query
+from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Request, Response, Query, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from django.db.models import Q
+from typing import Optional
+from django.db import transaction
+from django.db.models import Q, F
 from django.utils import timezone
-from datetime import timedelta
+from asgiref.sync import sync_to_async
 
-from creator_app.models import UserData, Conversation, Message
+from creator_app.models import UserData, Conversation, ConversationState, Message
+from fastapi_app.routes.chat_events import manager
+from fastapi_app.routes.presence import presence
+from fastapi_app.routes.uploads import save_upload_streamed, MAX_CHAT_UPLOAD_BYTES
+from fastapi_app.routes.thumbnails import thumb_path
 
 router = APIRouter(prefix="/message", tags=["Messaging"])
 
@@ -36,36 +42,114 @@ def get_or_create_conversation(user1, user2):
     return Conversation.objects.create(user1=user1, user2=user2)
 
 
+# -------------------------------
+# Helpers: message serialization
+# -------------------------------
+IMAGE_EXTENSIONS = ["jpg", "jpeg", "png", "gif", "bmp", "webp"]
+
+
+def get_file_url(base_url, file_obj):
+    if not file_obj:
+        return None
+    return f"{base_url}media/{file_obj.name}"
+
+
+def get_thumb_url(base_url, file_obj, size="md"):
+    thumb = thumb_path(file_obj, size) if file_obj else None
+    if not thumb:
+        return None
+    return f"{base_url}media/{thumb}"
+
+
+def get_message_type(file_obj):
+    if not file_obj:
+        return "text"
+    ext = file_obj.name.split(".")[-1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    return "file"
+
+
+def is_message_seen(m, state):
+    """ Seen if the recipient's read pointer has passed it (or legacy is_seen flag). """
+    if m.is_seen:
+        return True
+    if not state:
+        return False
+    recipient_id = state.conversation.user2_id if m.sender_id == state.conversation.user1_id else state.conversation.user1_id
+    last_read = state.last_read_for(recipient_id)
+    return last_read is not None and m.id <= last_read
+
+
+def serialize_message(m, base_url, state=None):
+    return {
+        "id": m.id,
+        "sender": m.sender_id,
+        "content": m.content,
+        "file_url": get_file_url(base_url, m.file),
+        "thumb_url": get_thumb_url(base_url, m.file),
+        "message_type": get_message_type(m.file),
+
+        "reply_to": (
+            {
+                "id": m.reply_to.id,
+                "content": m.reply_to.content,
+                "file_url": get_file_url(base_url, m.reply_to.file),
+                "thumb_url": get_thumb_url(base_url, m.reply_to.file, "sm"),
+                "message_type": get_message_type(m.reply_to.file),
+            }
+            if m.reply_to else None
+        ),
+
+        "is_seen": is_message_seen(m, state),
+        "created_at": m.created_at
+    }
+
+
 # -------------------------------
 # List users (for left panel)
 # -------------------------------
 @router.get("/users")
-def list_users(current_user_id: int = Query(...)):
+def list_users(
+    response: Response,
+    current_user_id: int = Query(...),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor value from the previous page"),
+):
+    """
+    Conversation inbox of the current user, newest activity first.
+    Reads the denormalized ConversationState rows directly (one query),
+    including the current user's unread count.
+    The cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    states = (
+        ConversationState.objects
+        .filter(
+            Q(conversation__user1_id=current_user_id) |
+            Q(conversation__user2_id=current_user_id),
+            last_message__isnull=False
+        )
+        .select_related("conversation__user1", "conversation__user2")
+        .order_by("-last_message_id")
+    )
+
+    if cursor:
+        states = states.filter(last_message_id__lt=cursor)
+
+    page = list(states[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
 
-    users = UserData.objects.all()
-    now = timezone.now()
     result = []
 
-    for u in users:
-        if not u.id:
-            continue
+    for st in page:
+        c = st.conversation
+        u = c.user2 if c.user1_id == current_user_id else c.user1
         if u.id == current_user_id:
             continue
 
-        # Online if active in last 60 seconds
-        online = False
-        if u.last_active:
-            online = (now - u.last_active) <= timedelta(seconds=60)
-
-        # Last message preview
-        convo_qs = Conversation.objects.filter(
-            Q(user1_id=current_user_id, user2=u) |
-            Q(user1=u, user2_id=current_user_id)
-        )
-
-        last_msg = Message.objects.filter(
-            conversation__in=convo_qs
-        ).order_by("-created_at").first()
+        # Online if active within the presence TTL
+        online = presence.is_online(u.id, u.last_active)
 
         display_name = (u.first_name or "") or (u.email or f"User {u.id}")
 
@@ -73,10 +157,15 @@ def list_users(current_user_id: int = Query(...)):
             "id": u.id,
             "name": display_name,
             "online": online,
-            "last_message": last_msg.content if last_msg else "",
-            "last_message_time": last_msg.created_at if last_msg else None,
+            "conversation_id": c.id,
+            "last_message": st.last_message_preview,
+            "last_message_time": st.last_message_at,
+            "unread_count": st.unread_for(current_user_id),
         })
 
+    if has_more:
+        response.headers["X-Next-Cursor"] = str(page[-1].last_message_id)
+
     return result
 
 
@@ -91,16 +180,19 @@ class TypingPayload(BaseModel):
 
 @router.post("/typing")
 def set_typing(payload: TypingPayload):
-    user = UserData.objects.filter(id=payload.user_id).first()
-    if not user:
+    if not UserData.objects.filter(id=payload.user_id).exists():
         raise HTTPException(status_code=404, detail="User not found")
 
-    # NEW — typing user + who they are typing to
-    user.typing_with = payload.chat_with
-    user.is_typing = payload.is_typing
-    user.last_active = timezone.now()
+    # Typing user + who they are typing to (in memory, no DB write)
+    presence.set_typing(payload.user_id, payload.chat_with, payload.is_typing)
 
-    user.save(update_fields=["is_typing", "typing_with", "last_active"])
+    # 🔔 Push typing state to the other side
+    manager.publish([payload.chat_with], {
+        "type": "typing",
+        "user_id": payload.user_id,
+        "chat_with": payload.chat_with,
+        "is_typing": payload.is_typing,
+    })
 
     return {"status": "ok"}
 
@@ -112,66 +204,55 @@ def set_typing(payload: TypingPayload):
 # Send Message (supports reply + file)
 # -------------------------------
 @router.post("/send")
-def send_message(
+async def send_message(
+    request: Request,
     sender_id: int = Form(...),
     receiver_id: int = Form(...),
     content: str = Form(None),
     reply_to: int = Form(None),
     file: UploadFile = File(None)
 ):
-    sender = UserData.objects.filter(id=sender_id).first()
-    receiver = UserData.objects.filter(id=receiver_id).first()
+    sender = await sync_to_async(UserData.objects.filter(id=sender_id).first)()
+    receiver = await sync_to_async(UserData.objects.filter(id=receiver_id).first)()
 
     if not sender or not receiver:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Update sender state
-    sender.last_active = timezone.now()
-    sender.is_typing = False
-    sender.typing_with = None
-    sender.save(update_fields=["last_active", "is_typing", "typing_with"])
-
-    convo = get_or_create_conversation(sender, receiver)
-
-    reply_obj = None
-    if reply_to:
-        reply_obj = Message.objects.filter(id=reply_to).first()
+    presence.touch(sender.id)
+    presence.clear_typing(sender.id)
 
+    # Streamed to disk in chunks, SHA-256 named → identical files are stored once
     file_path = None
-    if file:
-        import shutil, os
-        from django.conf import settings
-
-        folder = os.path.join(settings.MEDIA_ROOT, "message_files")
-        os.makedirs(folder, exist_ok=True)
-
-        save_path = os.path.join(folder, file.filename)
-        with open(save_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        file_path = f"message_files/{file.filename}"
+    if file and file.filename:
+        stored = await save_upload_streamed(file, "message_files", MAX_CHAT_UPLOAD_BYTES)
+        file_path = stored["path"]
 
     # -------------------------
     # FIX: Determine message type
     # -------------------------
-    if file:
+    if file_path:
         ext = file.filename.split(".")[-1].lower()
-        if ext in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]:
+        if ext in IMAGE_EXTENSIONS:
             msg_type = "image"
         else:
             msg_type = "file"
     else:
         msg_type = "text"
 
-    msg = Message.objects.create(
-        conversation=convo,
-        sender=sender,
-        content=content,
-        reply_to=reply_obj,
-        file=file_path,
-        message_type=msg_type
+    preview = content or (file.filename if file_path else "")
+
+    convo, msg, message_data = await sync_to_async(store_message)(
+        request.base_url, sender, receiver, content, reply_to, file_path, msg_type, preview
     )
 
+    # 🔔 Push to both participants (sender may have other tabs open)
+    manager.publish([sender.id, receiver.id], {
+        "type": "message",
+        "conversation_id": convo.id,
+        "message": message_data,
+    })
+
     return {
         "status": "success",
         "conversation_id": convo.id,    
@@ -181,12 +262,66 @@ def send_message(
     }
 
 
+def store_message(base_url, sender, receiver, content, reply_to, file_path, msg_type, preview):
+    """ DB side of send_message (runs in a worker thread). """
+    convo = get_or_create_conversation(sender, receiver)
+
+    reply_obj = None
+    if reply_to:
+        reply_obj = Message.objects.filter(id=reply_to).first()
+
+    with transaction.atomic():
+        msg = Message.objects.create(
+            conversation=convo,
+            sender=sender,
+            content=content,
+            reply_to=reply_obj,
+            file=file_path,
+            message_type=msg_type
+        )
+
+        # Incremental inbox state: last message + receiver unread + sender read pointer
+        ConversationState.objects.get_or_create(conversation=convo)
+        sender_side = "user1" if convo.user1_id == sender.id else "user2"
+        receiver_side = "user2" if sender_side == "user1" else "user1"
+        ConversationState.objects.filter(conversation=convo).update(
+            last_message=msg,
+            last_message_preview=preview[:255],
+            last_message_at=msg.created_at,
+            updated_at=timezone.now(),  # .update() skips auto_now
+            **{
+                f"{receiver_side}_unread": F(f"{receiver_side}_unread") + 1,
+                f"{sender_side}_last_read": msg.id,
+            }
+        )
+
+    return convo, msg, serialize_message(msg, base_url)
+
+
+
+MESSAGE_PAGE_SIZE = 50
 
 # -------------------------------
 # Get All Messages between 2 users
 # -------------------------------
 @router.get("/conversation/{user1_id}/{user2_id}")
-def get_messages(request: Request, user1_id: int, user2_id: int):
+def get_messages(
+    request: Request,
+    user1_id: int,
+    user2_id: int,
+    before_id: Optional[int] = Query(None, description="Older page: messages with id < before_id"),
+    after_id: Optional[int] = Query(None, description="Sync: messages with id > after_id"),
+    limit: Optional[int] = Query(None, ge=1, le=200, description=f"Page size (default {MESSAGE_PAGE_SIZE} with a cursor)"),
+):
+    """
+    Keyset-paginated history on (conversation_id, id).
+    - no cursor, no limit → the whole thread (original behaviour, kept for
+                            existing clients such as templates/chat.html)
+    - limit only → newest `limit` messages
+    - before_id  → the page just older than before_id ("load more")
+    - after_id   → everything newer than the client's last id (delta sync)
+    Messages are always returned oldest → newest.
+    """
 
     user1 = UserData.objects.filter(id=user1_id).first()
     user2 = UserData.objects.filter(id=user2_id).first()
@@ -194,9 +329,7 @@ def get_messages(request: Request, user1_id: int, user2_id: int):
     if not user1 or not user2:
         raise HTTPException(status_code=404, detail="User not found")
 
-    now = timezone.now()
-    user1.last_active = now
-    user1.save(update_fields=["last_active"])
+    presence.touch(user1.id)
 
     convo = Conversation.objects.filter(
         Q(user1=user1, user2=user2) |
@@ -208,57 +341,38 @@ def get_messages(request: Request, user1_id: int, user2_id: int):
             "conversation_id": None,
             "messages": [],
             "other_user_online": False,
-            "other_user_typing": (user2.is_typing and user2.typing_with == user1_id),  # UPDATED
-            "other_user_last_active": user2.last_active,
+            "other_user_typing": presence.is_typing_to(user2.id, user1_id),
+            "other_user_last_active": presence.last_active(user2.id, user2.last_active),
+            "has_more": False,
         }
 
-    msgs = convo.messages.order_by("created_at")
+    state = ConversationState.objects.filter(conversation=convo).select_related("conversation").first()
 
-    def get_file_url(file_obj):
-        if not file_obj:
-            return None
-        return f"{request.base_url}media/{file_obj.name}"
+    msgs = convo.messages.select_related("reply_to")
 
-    def get_message_type(file_obj):
-        if not file_obj:
-            return "text"
-        ext = file_obj.name.split(".")[-1].lower()
-        if ext in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]:
-            return "image"
-        return "file"
-
-    online = False
-    if user2.last_active:
-        online = (now - user2.last_active) <= timedelta(seconds=60)
+    if limit is None and before_id is None and after_id is None:
+        page = list(msgs.order_by("id"))
+        has_more = False
+    elif after_id is not None:
+        limit = limit or MESSAGE_PAGE_SIZE
+        page = list(msgs.filter(id__gt=after_id).order_by("id")[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+    else:
+        limit = limit or MESSAGE_PAGE_SIZE
+        if before_id is not None:
+            msgs = msgs.filter(id__lt=before_id)
+        page = list(msgs.order_by("-id")[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit][::-1]
 
     return {
         "conversation_id": convo.id,
-        "other_user_online": online,
-        "other_user_typing": (user2.is_typing and user2.typing_with == user1_id),  # UPDATED
-        "other_user_last_active": user2.last_active,
-        "messages": [
-            {
-                "id": m.id,
-                "sender": m.sender.id,
-                "content": m.content,
-                "file_url": get_file_url(m.file),
-                "message_type": get_message_type(m.file),
-
-                "reply_to": (
-                    {
-                        "id": m.reply_to.id,
-                        "content": m.reply_to.content,
-                        "file_url": get_file_url(m.reply_to.file),
-                        "message_type": get_message_type(m.reply_to.file),
-                    }
-                    if m.reply_to else None
-                ),
-
-                "is_seen": m.is_seen,
-                "created_at": m.created_at
-            }
-            for m in msgs
-        ]
+        "other_user_online": presence.is_online(user2.id, user2.last_active),
+        "other_user_typing": presence.is_typing_to(user2.id, user1_id),
+        "other_user_last_active": presence.last_active(user2.id, user2.last_active),
+        "has_more": has_more,
+        "messages": [serialize_message(m, request.base_url, state) for m in page]
     }
 
 
@@ -272,26 +386,62 @@ def mark_seen(conversation_id: int, user_id: int):
     if not convo:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
-    viewer = UserData.objects.filter(id=user_id).first()
-    if viewer:
-        viewer.last_active = timezone.now()
-        viewer.save(update_fields=["last_active"])
+    if user_id not in (convo.user1_id, convo.user2_id):
+        raise HTTPException(status_code=403, detail="Not a participant of this conversation")
 
-    Message.objects.filter(
-        conversation=convo
-    ).exclude(sender__id=user_id).update(is_seen=True)
+    presence.touch(user_id)
+
+    # Single-row write: move the viewer's read pointer to the last message
+    side = "user1" if convo.user1_id == user_id else "user2"
+    ConversationState.objects.filter(conversation=convo).update(updated_at=timezone.now(), **{
+        f"{side}_unread": 0,
+        f"{side}_last_read": F("last_message_id"),
+    })
+
+    # 🔔 Tell the other participant their messages were read
+    other_id = convo.user2_id if side == "user1" else convo.user1_id
+    manager.publish([other_id], {
+        "type": "seen",
+        "conversation_id": convo.id,
+        "seen_by": user_id,
+        "last_read_message_id": (
+            ConversationState.objects
+            .filter(conversation=convo)
+            .values_list("last_message_id", flat=True)
+            .first()
+        ),
+        "seen_at": timezone.now(),
+    })
 
     return {"status": "seen updated"}
 
 
 @router.post("/user/heartbeat")
 async def heartbeat(user_id: int):
-    from asgiref.sync import sync_to_async
-    from django.utils import timezone
-
-    await sync_to_async(
-        UserData.objects.filter(id=user_id).update,
-        thread_sensitive=True
-    )(last_active=timezone.now())
+    # In-memory only; last_active is flushed to the DB in batches
+    presence.touch(user_id)
 
     return {"status": "ok"}
+
+
+# -------------------------------
+# WebSocket push channel
+# -------------------------------
+@router.websocket("/ws/{user_id}")
+async def chat_socket(websocket: WebSocket, user_id: int):
+    """
+    Push channel for new messages, seen receipts and typing events.
+    Clients open it once per tab instead of polling /conversation.
+    """
+    await manager.connect(user_id, websocket)
+    presence.touch(user_id)
+    try:
+        while True:
+            data = await websocket.receive_text()
+            presence.touch(user_id)
+            if data == "ping":
+                await websocket.send_text("pong")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(user_id, websocket)
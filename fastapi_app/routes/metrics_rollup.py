@@ -0,0 +1,131 @@
+import fastapi_app.django_setup
+
+import os
+from datetime import date, timedelta
+
+from django.db.models import Sum, Count, Q
+from django.utils import timezone
+
+from creator_app.models import (
+    DailyMetrics,
+    UserData,
+    BillingHistory,
+    JobPost,
+    WalletTransaction
+)
+from fastapi_app.routes.timeseries import time_buckets
+
+# Today's (and yesterday's) rows keep changing → recompute when older than this
+ROLLUP_FRESHNESS_SECONDS = int(os.getenv("ROLLUP_FRESHNESS_SECONDS", 300))
+
+ROLLUP_FIELDS = [
+    "revenue", "new_creators", "new_collaborators",
+    "job_posts", "wallet_transactions", "updated_at"
+]
+
+
+# =========================================================
+# 🔹 COMPUTE A DAY RANGE (one grouped query per source table)
+# =========================================================
+def compute_days(start: date, end: date) -> dict:
+    """ Aggregates the raw tables per (UTC) day for [start, end] → {day: values}. """
+    revenue = time_buckets(
+        BillingHistory.objects.filter(status="paid"), "paid_on", "day", start, end,
+        revenue=Sum("amount")
+    )
+    users = time_buckets(
+        UserData.objects.all(), "created_at", "day", start, end,
+        new_creators=Count("id", filter=Q(role__iexact="Creator")),
+        new_collaborators=Count("id", filter=Q(role__iexact="Collaborator"))
+    )
+    jobs = time_buckets(JobPost.objects.all(), "created_at", "day", start, end, job_posts=Count("id"))
+    txns = time_buckets(WalletTransaction.objects.all(), "created_at", "day", start, end, wallet_transactions=Count("id"))
+
+    return {day: {**revenue[day], **users[day], **jobs[day], **txns[day]} for day in revenue}
+
+
+def rollup_range(start: date, end: date, existing: dict = None) -> dict:
+    """ Recomputes [start, end] and upserts it in bulk. Returns {date: DailyMetrics}. """
+    if existing is None:
+        existing = {r.date: r for r in DailyMetrics.objects.filter(date__gte=start, date__lte=end)}
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    for day, values in compute_days(start, end).items():
+        row = existing.get(day)
+        if row is None:
+            row = DailyMetrics(date=day, **values)
+            to_create.append(row)
+        else:
+            for field, value in values.items():
+                setattr(row, field, value)
+            row.updated_at = now  # bulk_update skips auto_now
+            to_update.append(row)
+        existing[day] = row
+
+    if to_create:
+        DailyMetrics.objects.bulk_create(to_create, batch_size=500)
+    if to_update:
+        DailyMetrics.objects.bulk_update(to_update, ROLLUP_FIELDS, batch_size=500)
+    return existing
+
+
+# =========================================================
+# 🔹 INCREMENTAL FILL
+# =========================================================
+def ensure_rollups(start: date, end: date):
+    """
+    Makes sure every day of [start, end] up to today has a DailyMetrics row.
+    Missing days are computed and today/yesterday are refreshed when stale.
+
+    Migration 0004 writes a row for every day since the first recorded
+    activity, so days before the oldest row hold no data and are skipped;
+    what is left to fill is only the gap since the charts were last viewed.
+    """
+    today = timezone.now().date()
+    first = DailyMetrics.objects.order_by("date").values_list("date", flat=True).first()
+    end = min(end, today)
+    start = max(start, first or today)
+    if start > end:
+        return
+
+    rows = {r.date: r for r in DailyMetrics.objects.filter(date__gte=start, date__lte=end)}
+    stale_before = timezone.now() - timedelta(seconds=ROLLUP_FRESHNESS_SECONDS)
+
+    needed = []
+    day = start
+    while day <= end:
+        row = rows.get(day)
+        still_open = day >= today - timedelta(days=1)
+        if row is None or (still_open and row.updated_at < stale_before):
+            needed.append(day)
+        day += timedelta(days=1)
+
+    if needed:
+        # One recompute over the span of missing days instead of one per day
+        rollup_range(needed[0], needed[-1], rows)
+
+
+def rollup_recent(days: int = 2, chunk_days: int = 31):
+    """
+    Job entry point (management command): recompute the last `days` days,
+    a month-sized span at a time, e.g. after correcting historical data.
+    """
+    today = timezone.now().date()
+    start = today - timedelta(days=days - 1)
+    while start <= today:
+        end = min(start + timedelta(days=chunk_days - 1), today)
+        rollup_range(start, end)
+        start = end + timedelta(days=1)
+
+
+# =========================================================
+# 🔹 READ HELPER (charts)
+# =========================================================
+def metric_series(unit: str, start: date, end: date, **measures):
+    """
+    Fills [start, end] if needed, then buckets the DailyMetrics rows by
+    day/week/month in one grouped query, e.g. metric_series("month", s, e, revenue=Sum("revenue")).
+    """
+    ensure_rollups(start, end)
+    return time_buckets(DailyMetrics.objects.all(), "date", unit, start, end, **measures)
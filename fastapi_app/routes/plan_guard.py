@@ -1,7 +1,15 @@
 import fastapi_app.django_setup
  
+import os
+import threading
+import time
+from datetime import date
+
 from fastapi import HTTPException
+from django.db import transaction
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from creator_app.models import (
     UserData,
     UserSubscription,
@@ -11,6 +19,141 @@ from creator_app.models import (
     Contract
 )
  
+# =========================================================
+# 🔹 PLAN + QUOTA CACHE
+# =========================================================
+# Plans rarely change → cached by normalized name, dropped on any plan save/delete.
+# Usage counters are seeded with one COUNT(*) and then kept up to date by the
+# create/delete signals below (after commit) — but only in the process that did
+# the write, so other workers' writes are invisible to them. Checks made inside
+# the caller's write transaction therefore never trust the cache: they count
+# from the DB under a lock (see checked_usage).
+PLAN_CACHE_TTL = int(os.getenv("PLAN_CACHE_TTL", 60))
+USAGE_CACHE_TTL = int(os.getenv("USAGE_CACHE_TTL", 300))
+
+_cache_lock = threading.Lock()
+_plan_cache = {}   # normalized plan name -> (plan | None, cached_at)
+_usage_cache = {}  # (kind, user_id, ...) -> (count, seeded_at)
+
+
+def normalize_plan_name(name):
+    return (name or "").strip().lower()
+
+
+def get_plan_by_name(plan_name):
+    key = normalize_plan_name(plan_name)
+    now = time.monotonic()
+
+    with _cache_lock:
+        hit = _plan_cache.get(key)
+    if hit and now - hit[1] < PLAN_CACHE_TTL:
+        return hit[0]
+
+    plan = SubscriptionPlan.objects.filter(name__iexact=plan_name.strip()).first()
+
+    with _cache_lock:
+        _plan_cache[key] = (plan, now)
+    return plan
+
+
+def invalidate_plan_cache():
+    with _cache_lock:
+        _plan_cache.clear()
+
+
+def get_usage(key, count_fn):
+    """ Cached counter for `key`, seeded from `count_fn()` on miss / expiry. """
+    now = time.monotonic()
+
+    with _cache_lock:
+        hit = _usage_cache.get(key)
+    if hit and now - hit[1] < USAGE_CACHE_TTL:
+        return hit[0]
+
+    count = count_fn()
+
+    with _cache_lock:
+        _usage_cache[key] = (count, now)
+    return count
+
+
+def seed_usage(key, count):
+    with _cache_lock:
+        _usage_cache[key] = (count, time.monotonic())
+
+
+def checked_usage(user, key, queryset):
+    """
+    Usage count to enforce a limit with.
+
+    Inside the caller's write transaction: lock the user's row, which
+    serializes this user's quota-consuming writes across all workers, and
+    count with a locking read, which sees rows committed after the
+    transaction's snapshot. Outside one (read-only checks) the cached
+    counter is good enough.
+    """
+    if not transaction.get_connection().in_atomic_block:
+        return get_usage(key, queryset.count)
+
+    list(UserData.objects.select_for_update().filter(pk=user.pk).values_list("pk", flat=True))
+    count = len(queryset.select_for_update().values_list("pk", flat=True))
+    seed_usage(key, count)
+    return count
+
+
+def bump_usage(key, delta):
+    # Only adjust counters that are already seeded; a miss re-counts anyway
+    with _cache_lock:
+        hit = _usage_cache.get(key)
+        if hit:
+            _usage_cache[key] = (max(0, hit[0] + delta), hit[1])
+
+
+def bump_usage_on_commit(key, delta):
+    """ A rolled-back write must not move the counter. """
+    transaction.on_commit(lambda: bump_usage(key, delta))
+
+
+def _invite_month(value):
+    if isinstance(value, str):
+        try:
+            value = date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return (value.year, value.month) if value else None
+
+
+@receiver([post_save, post_delete], sender=SubscriptionPlan)
+def _plan_changed(sender, **kwargs):
+    invalidate_plan_cache()
+
+
+@receiver(post_save, sender=JobPost)
+@receiver(post_delete, sender=JobPost)
+def _job_usage(sender, instance, created=None, **kwargs):
+    if created is False:
+        return
+    bump_usage_on_commit(("job_posts", instance.employer_id), 1 if created else -1)
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+def _contract_usage(sender, instance, created=None, **kwargs):
+    if created is False:
+        return
+    bump_usage_on_commit(("contracts", instance.creator_id), 1 if created else -1)
+
+
+@receiver(post_save, sender=Invitation)
+@receiver(post_delete, sender=Invitation)
+def _invite_usage(sender, instance, created=None, **kwargs):
+    if created is False:
+        return
+    month = _invite_month(instance.date)
+    if month:
+        bump_usage_on_commit(("invitations", instance.sender_id) + month, 1 if created else -1)
+
+
 # =========================================================
 # 🔹 HELPER: GET LIMIT SAFELY
 # =========================================================
@@ -49,8 +192,8 @@ def get_user_plan(user: UserData):
             detail="Subscription plan not set. Contact admin."
         )
  
-    # 2. Find the Plan in DB
-    plan = SubscriptionPlan.objects.filter(name__iexact=plan_name).first()
+    # 2. Find the Plan (cached by normalized name)
+    plan = get_plan_by_name(plan_name)
  
     if not plan:
         # Fallback error if the plan name in subscription doesn't match any plan table entry
@@ -100,7 +243,11 @@ def check_job_limit(user: UserData):
     # Default to 1 job post if limit is missing
     limit = get_limit(plan, "job_posts", 1)
  
-    current_jobs = JobPost.objects.filter(employer=user).count()
+    current_jobs = checked_usage(
+        user,
+        ("job_posts", user.id),
+        JobPost.objects.filter(employer=user)
+    )
  
     print(f"DEBUG → Jobs: {current_jobs} / {limit}")
  
@@ -119,11 +266,16 @@ def check_invite_limit(user: UserData):
     # Default to 5 invites if missing
     limit = get_limit(plan, "invitations", 5)
  
-    sent_this_month = Invitation.objects.filter(
-        sender=user,
-        date__year=timezone.now().year,
-        date__month=timezone.now().month
-    ).count()
+    now = timezone.now()
+    sent_this_month = checked_usage(
+        user,
+        ("invitations", user.id, now.year, now.month),
+        Invitation.objects.filter(
+            sender=user,
+            date__year=now.year,
+            date__month=now.month
+        )
+    )
  
     print(f"DEBUG → Invites: {sent_this_month} / {limit}")
  
@@ -142,7 +294,11 @@ def check_contract_limit(user: UserData):
     # Default to 1 contract if missing
     limit = get_limit(plan, "contracts", 1)
  
-    active_contracts = Contract.objects.filter(creator=user).count()
+    active_contracts = checked_usage(
+        user,
+        ("contracts", user.id),
+        Contract.objects.filter(creator=user)
+    )
  
     print(f"DEBUG → Contracts: {active_contracts} / {limit}")
  
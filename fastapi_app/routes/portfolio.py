@@ -6,6 +6,7 @@ from django.core.files.base import ContentFile
 from django.conf import settings
 
 from creator_app.models import UserData, PortfolioItem
+from fastapi_app.routes.thumbnails import thumb_path
 
 
 router = APIRouter(prefix="/portfolio", tags=["Creator Portfolio"])
@@ -81,6 +82,10 @@ def get_portfolio_list(user_id: int):
                 f"http://127.0.0.1:8000/{i.file}"
                 if i.file else None
             ),
+            "thumb_url": (
+                f"http://127.0.0.1:8000/media/{thumb_path(i.file)}"
+                if i.file and thumb_path(i.file) else None
+            ),
         }
         for i in items
     ]
@@ -0,0 +1,171 @@
+import fastapi_app.django_setup
+
+import atexit
+import os
+import threading
+from datetime import timedelta
+from typing import Dict
+
+from django.utils import timezone
+
+from creator_app.models import UserData
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+ONLINE_TTL_SECONDS = int(os.getenv("PRESENCE_ONLINE_TTL", 60))
+TYPING_TTL_SECONDS = int(os.getenv("PRESENCE_TYPING_TTL", 8))
+FLUSH_INTERVAL_SECONDS = int(os.getenv("PRESENCE_FLUSH_SECONDS", 30))
+
+
+# =========================================================
+# 🔹 STORE (process memory)
+# =========================================================
+class InMemoryPresenceStore:
+    """
+    Default presence store. A shared store (e.g. Redis) can replace it
+    as long as it exposes the same methods.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_seen: Dict[int, object] = {}
+        self._typing: Dict[int, tuple] = {}
+        self._dirty = set()
+
+    def touch(self, user_id: int, at):
+        with self._lock:
+            self._last_seen[user_id] = at
+            self._dirty.add(user_id)
+
+    def get_last_seen(self, user_id: int):
+        return self._last_seen.get(user_id)
+
+    def set_typing(self, user_id: int, chat_with: int, expires_at):
+        with self._lock:
+            self._typing[user_id] = (chat_with, expires_at)
+
+    def clear_typing(self, user_id: int):
+        with self._lock:
+            self._typing.pop(user_id, None)
+
+    def get_typing(self, user_id: int):
+        return self._typing.get(user_id)
+
+    def pop_dirty(self) -> Dict[int, object]:
+        with self._lock:
+            dirty = {uid: self._last_seen[uid] for uid in self._dirty if uid in self._last_seen}
+            self._dirty.clear()
+            return dirty
+
+    def mark_dirty(self, user_ids):
+        """ Queue users again after a failed flush (their latest value is written next time). """
+        with self._lock:
+            self._dirty.update(uid for uid in user_ids if uid in self._last_seen)
+
+    def prune(self, older_than):
+        """ Drop entries that are already flushed and no longer online. """
+        with self._lock:
+            for uid, seen in list(self._last_seen.items()):
+                if uid not in self._dirty and seen < older_than:
+                    del self._last_seen[uid]
+            for uid, (_, expires_at) in list(self._typing.items()):
+                if expires_at < older_than:
+                    del self._typing[uid]
+
+
+# =========================================================
+# 🔹 PRESENCE SERVICE
+# =========================================================
+class PresenceService:
+    """
+    Online + typing state kept in memory with TTL expiry.
+    `last_active` is written to UserData in batches every
+    FLUSH_INTERVAL_SECONDS instead of on every request.
+    """
+
+    def __init__(self, store=None, online_ttl=ONLINE_TTL_SECONDS,
+                 typing_ttl=TYPING_TTL_SECONDS, flush_interval=FLUSH_INTERVAL_SECONDS):
+        self.store = store or InMemoryPresenceStore()
+        self.online_ttl = timedelta(seconds=online_ttl)
+        self.typing_ttl = timedelta(seconds=typing_ttl)
+        self.flush_interval = flush_interval
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # ---------------- writes ----------------
+    def touch(self, user_id: int):
+        self.store.touch(user_id, timezone.now())
+        self._ensure_flusher()
+
+    def set_typing(self, user_id: int, chat_with: int, is_typing: bool):
+        self.touch(user_id)
+        if is_typing:
+            self.store.set_typing(user_id, chat_with, timezone.now() + self.typing_ttl)
+        else:
+            self.store.clear_typing(user_id)
+
+    def clear_typing(self, user_id: int):
+        self.store.clear_typing(user_id)
+
+    # ---------------- reads ----------------
+    def last_active(self, user_id: int, fallback=None):
+        """ In-memory timestamp, or the persisted UserData.last_active. """
+        return self.store.get_last_seen(user_id) or fallback
+
+    def is_online(self, user_id: int, fallback=None) -> bool:
+        seen = self.last_active(user_id, fallback)
+        if not seen:
+            return False
+        return (timezone.now() - seen) <= self.online_ttl
+
+    def is_typing_to(self, user_id: int, other_id: int) -> bool:
+        typing = self.store.get_typing(user_id)
+        if not typing:
+            return False
+        chat_with, expires_at = typing
+        return chat_with == other_id and expires_at > timezone.now()
+
+    # ---------------- flushing ----------------
+    def flush(self):
+        dirty = self.store.pop_dirty()
+        if dirty:
+            try:
+                UserData.objects.bulk_update(
+                    [UserData(id=uid, last_active=seen) for uid, seen in dirty.items()],
+                    ["last_active"],
+                    batch_size=500,
+                )
+            except Exception:
+                # Keep them dirty so prune() doesn't drop the unwritten values
+                self.store.mark_dirty(dirty)
+                raise
+        self.store.prune(timezone.now() - self.online_ttl)
+
+    def _run_flusher(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print("❌ Presence flush failed:", e)
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._flusher_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._run_flusher, name="presence-flusher", daemon=True)
+            self._flusher.start()
+            atexit.register(self.shutdown)
+
+    def shutdown(self):
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception as e:
+            print("❌ Presence flush failed:", e)
+
+
+presence = PresenceService()
@@ -1,29 +1,23 @@
 import json
 from enum import Enum
-from fastapi import APIRouter, Form, UploadFile, File, HTTPException
+from fastapi import APIRouter, Form, UploadFile, File, HTTPException, Query, Response
 import os
+import base64
+from datetime import datetime
+from typing import Optional
 from django.conf import settings
 from creator_app.models import JobPost, UserData, Proposal
-from django.db.models import Sum
-from creator_app.models import WalletTransaction
-from django.db.models import Avg, Count
-from creator_app.models import Review,CollaboratorProfile
+from django.db.models import Q
 from fastapi import Body
-import pycountry
 from creator_app.models import Contract
 from datetime import date
 from fastapi_app.routes.plan_guard import check_contract_limit
+from fastapi_app.routes.reputation import reputation_of
+from fastapi_app.routes.geo import get_country_code as resolve_country_code
 from django.db import transaction
 
 def get_country_code(country_name: str | None):
-    if not country_name:
-        return ""
-
-    try:
-        country = pycountry.countries.search_fuzzy(country_name)[0]
-        return country.alpha_2.lower()  # "IN", "US" → "in", "us"
-    except LookupError:
-        return ""
+    return (resolve_country_code(country_name) or "").lower()  # "IN", "US" → "in", "us"
 
  
 router = APIRouter(prefix="/proposals", tags=["Proposals"])
@@ -280,43 +274,55 @@ def withdraw_proposal(proposal_id: int):
         raise HTTPException(status_code=404, detail="Proposal not found")
 
 
+def encode_proposal_cursor(p):
+    raw = f"{p.created_at.isoformat()}|{p.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_proposal_cursor(cursor: str):
+    try:
+        created_at, proposal_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(proposal_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/GetProposalsForCreator/{creator_id}")
-def get_proposals_for_creator(creator_id: int):
+def get_proposals_for_creator(
+    creator_id: int,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page")
+):
+    """ Newest first, `limit` per page; the next page's cursor is sent in the X-Next-Cursor header. """
+    after = decode_proposal_cursor(cursor) if cursor else None
+
     try:
+        # One query: freelancer, profile and reputation (rating + earnings) are joined rows
         proposals = (
             Proposal.objects
             .select_related(
-                "job",          # FK → JobPost
-                "freelancer"    # FK → UserData
-            )
-            .prefetch_related(
-                "freelancer__my_proposals"
+                "freelancer",                       # FK → UserData
+                "freelancer__collaboratorprofile",
+                "freelancer__reputation"
             )
             .filter(job__employer_id=creator_id)
-            .order_by("-created_at")
+            .order_by("-created_at", "-id")
         )
+        if after:
+            created_at, proposal_id = after
+            proposals = proposals.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=proposal_id)
+            )
 
-        data = []
+        page = list(proposals[:limit + 1])
+        next_cursor = encode_proposal_cursor(page[limit - 1]) if len(page) > limit else None
 
-        for p in proposals:
-            total_earnings = (
-                WalletTransaction.objects
-                .filter(to_user=p.freelancer)
-                .aggregate(total=Sum("amount"))["total"]
-            ) or 0
-
-            rating_data = (
-                Review.objects
-                .filter(recipient=p.freelancer)
-                .aggregate(
-                    avg_rating=Avg("rating"),
-                    review_count=Count("id")
-                )
-            )
+        data = []
 
-            profile = CollaboratorProfile.objects.filter(
-                user=p.freelancer
-            ).first()
+        for p in page[:limit]:
+            # ⭐ Earnings (wallet transfers received) + rating, from the joined reputation row
+            reputation = reputation_of(p.freelancer)
+            profile = getattr(p.freelancer, "collaboratorprofile", None)
 
             data.append({
                 "id": p.id,
@@ -327,10 +333,10 @@ def get_proposals_for_creator(creator_id: int):
                     if p.freelancer.profile_picture else ""
                 ),
                 "bid_amount": float(p.bid_amount or 0),
-                "total_earnings": float(total_earnings),
+                "total_earnings": float(reputation.wallet_earnings),
                 "skills": p.skills or [],
-                "rating": round(rating_data["avg_rating"] or 0, 1),
-                "reviews": rating_data["review_count"] or 0,
+                "rating": reputation.rating,
+                "reviews": reputation.review_count,
                 "city": p.freelancer.city or "",
                 "country": p.freelancer.location or "",
                 "country_code": get_country_code(p.freelancer.location),
@@ -338,6 +344,8 @@ def get_proposals_for_creator(creator_id: int):
                 "date": p.created_at.strftime("%Y-%m-%d"),
             })
 
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return {"proposals": data}
 
     except Exception as e:
@@ -401,9 +409,10 @@ def accept_proposal(proposal_id: int, creator_id: int):
             detail="Only job creator can accept proposals"
         )
 
-    check_contract_limit(creator)
-
     with transaction.atomic():
+        # 🔒 PLAN LIMIT CHECK (same transaction as the insert)
+        check_contract_limit(creator)
+
         contract = Contract.objects.create(
             job=job,
             creator=creator,
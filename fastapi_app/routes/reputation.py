@@ -0,0 +1,92 @@
+import fastapi_app.django_setup
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from creator_app.models import Contract, Review, UserReputation, WalletTransaction
+
+REPUTATION_PARTS = ("reviews", "contracts", "wallet")
+
+
+# =========================================================
+# 🔹 REFRESH (one user, one grouped aggregate per part)
+# =========================================================
+def _review_stats(user_id):
+    stats = Review.objects.filter(recipient_id=user_id).aggregate(n=Count("id"), total=Sum("rating"))
+    count, total = stats["n"] or 0, stats["total"] or 0
+    return {"review_count": count, "rating_sum": total, "rating_avg": total / count if count else 0}
+
+
+def _contract_stats(user_id):
+    stats = Contract.objects.filter(collaborator_id=user_id, status="completed").aggregate(n=Count("id"), total=Sum("budget"))
+    return {"completed_contracts": stats["n"] or 0, "contract_earnings": stats["total"] or 0}
+
+
+def _wallet_stats(user_id):
+    total = WalletTransaction.objects.filter(to_user_id=user_id).aggregate(total=Sum("amount"))["total"]
+    return {"wallet_earnings": total or 0}
+
+
+_PART_STATS = {"reviews": _review_stats, "contracts": _contract_stats, "wallet": _wallet_stats}
+
+
+def refresh_reputation(user_id, parts=REPUTATION_PARTS):
+    """
+    Recompute `parts` of a user's reputation row from the source tables.
+
+    The row is locked before aggregating, so concurrent refreshes for the
+    same user run one after the other and the last one sees every commit.
+    """
+    if not user_id:
+        return None
+    with transaction.atomic():
+        rep, _ = UserReputation.objects.select_for_update().get_or_create(user_id=user_id)
+        for part in parts:
+            for field, value in _PART_STATS[part](user_id).items():
+                setattr(rep, field, value)
+        rep.save()
+    return rep
+
+
+def schedule_refresh(user_id, *parts):
+    """ Refresh once the surrounding transaction commits (immediately in autocommit). """
+    if user_id:
+        transaction.on_commit(lambda: refresh_reputation(user_id, parts))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def reputation_review_changed(sender, instance, **kwargs):
+    schedule_refresh(instance.recipient_id, "reviews")
+
+
+@receiver(post_save, sender=Contract)
+@receiver(post_delete, sender=Contract)
+def reputation_contract_changed(sender, instance, **kwargs):
+    schedule_refresh(instance.collaborator_id, "contracts")
+
+
+@receiver(post_save, sender=WalletTransaction)
+@receiver(post_delete, sender=WalletTransaction)
+def reputation_transfer_changed(sender, instance, **kwargs):
+    schedule_refresh(instance.to_user_id, "wallet")
+
+
+# =========================================================
+# 🔹 READS
+# =========================================================
+def reputation_of(user) -> UserReputation:
+    """
+    The user's reputation row (select_related("...reputation") to avoid the
+    extra query); users with no reviews or earnings yet get an empty row.
+    """
+    try:
+        return user.reputation
+    except UserReputation.DoesNotExist:
+        return UserReputation(user_id=user.id)
+
+
+def get_reputation(user_id) -> UserReputation:
+    return UserReputation.objects.filter(user_id=user_id).first() or UserReputation(user_id=user_id)
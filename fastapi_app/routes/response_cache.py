@@ -0,0 +1,183 @@
+import fastapi_app.django_setup
+
+import functools
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from creator_app.models import (
+    UserData,
+    UserSubscription,
+    BillingHistory,
+    WalletTransaction,
+    Wallet,
+    JobPost,
+    Contract
+)
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+# RESPONSE_CACHE_URL=redis://localhost:6379/1 shares entries + versions across
+# workers (needs the `redis` package); otherwise each process keeps its own LRU
+# and the per-endpoint TTL bounds how stale another worker can be.
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+RESPONSE_CACHE_PREFIX = "respcache:"
+
+
+# =========================================================
+# 🔹 BACKENDS
+# =========================================================
+class InMemoryLRUBackend:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()   # key -> (value, expires_at)
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            hit = self.entries.get(key)
+            if hit is None:
+                return None
+            if hit[1] < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return hit[0]
+
+    def set(self, key, value, ttl: int):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_counter(self, key) -> int:
+        with self.lock:
+            return self.counters.get(key, 0)
+
+    def incr(self, key):
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+
+class RedisBackend:
+    def __init__(self, url: str):
+        import redis  # optional dependency, only needed with RESPONSE_CACHE_URL
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self.client.get(RESPONSE_CACHE_PREFIX + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl: int):
+        self.client.set(RESPONSE_CACHE_PREFIX + key, pickle.dumps(value), ex=ttl)
+
+    def get_counter(self, key) -> int:
+        return int(self.client.get(RESPONSE_CACHE_PREFIX + key) or 0)
+
+    def incr(self, key):
+        self.client.incr(RESPONSE_CACHE_PREFIX + key)
+
+
+def _make_backend():
+    if RESPONSE_CACHE_URL:
+        try:
+            return RedisBackend(RESPONSE_CACHE_URL)
+        except Exception as e:
+            print("⚠️ Response cache: Redis unavailable, using in-process LRU:", e)
+    return InMemoryLRUBackend(RESPONSE_CACHE_MAX_ENTRIES)
+
+
+# =========================================================
+# 🔹 VERSIONED RESPONSE CACHE
+# =========================================================
+class ResponseCache:
+    """
+    Entries are keyed by endpoint name + call args + the current version of
+    every data group they read. Writes bump a group's version (see receivers
+    below), so stale entries are simply never looked up again and age out.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def versions(self, groups):
+        return [self.backend.get_counter(f"version:{g}") for g in groups]
+
+    def bump(self, *groups):
+        for g in groups:
+            try:
+                self.backend.incr(f"version:{g}")
+            except Exception as e:
+                print(f"⚠️ Response cache: could not bump {g}:", e)
+
+    def cached(self, name: str, ttl: int, groups):
+        """
+        Decorator for sync endpoints. Only plain-value kwargs (query params)
+        go into the key; dependency objects such as the admin are ignored.
+        """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                try:
+                    key = self._key(name, groups, kwargs)
+                    hit = self.backend.get(key)
+                except Exception as e:
+                    print(f"⚠️ Response cache read failed for {name}:", e)
+                    return fn(*args, **kwargs)
+                if hit is not None:
+                    return hit
+
+                result = fn(*args, **kwargs)
+                try:
+                    self.backend.set(key, result, ttl)
+                except Exception as e:
+                    print(f"⚠️ Response cache write failed for {name}:", e)
+                return result
+            return wrapper
+        return decorator
+
+    def _key(self, name, groups, kwargs):
+        params = {
+            k: (v.isoformat() if isinstance(v, (date, datetime)) else v)
+            for k, v in sorted(kwargs.items())
+            if v is None or isinstance(v, (str, int, float, bool, date, datetime))
+        }
+        raw = json.dumps([name, self.versions(groups), params], default=str)
+        return f"{name}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+response_cache = ResponseCache(_make_backend())
+
+
+# =========================================================
+# 🔹 WRITE-DRIVEN INVALIDATION
+# =========================================================
+CACHE_GROUPS = {
+    UserData: "users",
+    UserSubscription: "subscriptions",
+    BillingHistory: "billing",
+    WalletTransaction: "wallet",
+    Wallet: "wallet",
+    JobPost: "jobs",
+    Contract: "contracts",
+}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_cache_version(sender, **kwargs):
+    group = CACHE_GROUPS.get(sender)
+    if group:
+        response_cache.bump(group)
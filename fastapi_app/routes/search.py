@@ -0,0 +1,223 @@
+import fastapi_app.django_setup
+
+import bisect
+import heapq
+import itertools
+import os
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from creator_app.models import CollaboratorProfile, CreatorProfile, JobPost
+from fastapi_app.routes.skill_index import normalize_term, as_skill_list
+from fastapi_app.routes.lazy_index import InvalidatedIndex
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+SUGGEST_REBUILD_SECONDS = int(os.getenv("SUGGEST_REBUILD_SECONDS", 600))
+SUGGEST_MAX_LIMIT = 25
+# Prefixes this short match a large slice of the index: their ranked top
+# SUGGEST_MAX_LIMIT is memoized until the index next changes.
+SUGGEST_SHORT_PREFIX = 2
+SUGGEST_TYPES = ["skill", "job_title", "creator"]
+
+
+def source_entries(instance) -> set:
+    """ {(type, display text)} a model row contributes to the suggestions. """
+    entries = set()
+    if isinstance(instance, CollaboratorProfile):
+        for skill in as_skill_list(instance.skills):
+            entries.add(("skill", skill.strip()))
+    elif isinstance(instance, JobPost):
+        if (instance.status or "").lower() == "posted":
+            for skill in as_skill_list(instance.skills):
+                entries.add(("skill", skill.strip()))
+            if instance.title:
+                entries.add(("job_title", instance.title.strip()))
+    elif isinstance(instance, CreatorProfile):
+        if instance.creator_name:
+            entries.add(("creator", instance.creator_name.strip()))
+    return entries
+
+
+def entry_keys(text: str) -> list:
+    """ Every word-start suffix, so "UI/UX Designer" is found by "ui/", "ux d" and "designer". """
+    norm = normalize_term(text)
+    keys = {
+        norm[i:] for i in range(len(norm))
+        if norm[i].isalnum() and (i == 0 or not norm[i - 1].isalnum())
+    }
+    return sorted(keys)
+
+
+# =========================================================
+# 🔹 SORTED-ARRAY PREFIX INDEX
+# =========================================================
+class SuggestIndex:
+    """
+    `keys` is a sorted list of (key, type, term); a prefix lookup is one
+    bisect plus a short forward scan. `counts` says how many rows use each
+    (type, term) — the ranking weight — and `sources` remembers what every
+    row contributed so saves/deletes can be applied as diffs.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.keys = []
+        self.counts = {}     # (type, term) -> [display, count]
+        self.sources = {}    # (model label, pk) -> {(type, display)}
+        self.short_top = {}  # (prefix, kinds) -> ranked top SUGGEST_MAX_LIMIT
+
+    # ---- maintenance ----
+    def _add(self, kind, display):
+        term = normalize_term(display)
+        if not term:
+            return
+        entry = self.counts.get((kind, term))
+        if entry:
+            entry[1] += 1
+            return
+        self.counts[(kind, term)] = [display, 1]
+        for key in entry_keys(display):
+            bisect.insort(self.keys, (key, kind, term))
+
+    def _discard(self, kind, display):
+        term = normalize_term(display)
+        entry = self.counts.get((kind, term))
+        if not entry:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del self.counts[(kind, term)]
+        for key in entry_keys(display):
+            i = bisect.bisect_left(self.keys, (key, kind, term))
+            if i < len(self.keys) and self.keys[i] == (key, kind, term):
+                del self.keys[i]
+
+    def update_source(self, source_key, entries: set):
+        with self.lock:
+            self.short_top = {}
+            old = self.sources.pop(source_key, set())
+            for kind, display in old - entries:
+                self._discard(kind, display)
+            for kind, display in entries - old:
+                self._add(kind, display)
+            if entries:
+                self.sources[source_key] = entries
+
+    # ---- build ----
+    @classmethod
+    def build(cls):
+        index = cls()
+        sources = [
+            CollaboratorProfile.objects.only("id", "skills"),
+            JobPost.objects.filter(status__iexact="posted").only("id", "status", "title", "skills"),
+            CreatorProfile.objects.only("id", "creator_name"),
+        ]
+        for queryset in sources:
+            for obj in queryset.iterator(chunk_size=2000):
+                entries = source_entries(obj)
+                index.sources[(obj._meta.label, obj.pk)] = entries
+                for kind, display in entries:
+                    term = normalize_term(display)
+                    if not term:
+                        continue
+                    entry = index.counts.setdefault((kind, term), [display, 0])
+                    entry[1] += 1
+        index.keys = sorted(
+            (key, kind, term)
+            for (kind, term), (display, _) in index.counts.items()
+            for key in entry_keys(display)
+        )
+        return index
+
+    # ---- lookup ----
+    def _ranked(self, prefix, kinds, limit):
+        """
+        Every key starting with `prefix` is considered (no scan cap), so the
+        best-ranked terms win rather than the first ones alphabetically.
+        """
+        seen = {}
+        i = bisect.bisect_left(self.keys, (prefix,))
+        for key, kind, term in itertools.islice(self.keys, i, None):
+            if not key.startswith(prefix):
+                break
+            if kinds and kind not in kinds:
+                continue
+            entry = self.counts.get((kind, term))
+            if entry:
+                # whole-text prefix beats a later-word match
+                starts = term.startswith(prefix)
+                best = seen.get((kind, term))
+                if best is None or starts > best[0]:
+                    seen[(kind, term)] = (starts, entry[1], entry[0])
+
+        top = heapq.nsmallest(
+            limit, seen.items(),
+            key=lambda item: (not item[1][0], -item[1][1], len(item[0][1]), item[0][1])
+        )
+        return [
+            {"text": display, "type": kind, "count": count}
+            for (kind, _), (_, count, display) in top
+        ]
+
+    def suggest(self, prefix: str, limit: int = 10, kinds=None):
+        prefix = normalize_term(prefix)
+        if not prefix:
+            return []
+
+        with self.lock:
+            if len(prefix) > SUGGEST_SHORT_PREFIX:
+                return self._ranked(prefix, kinds, limit)
+            memo_key = (prefix, frozenset(kinds or ()))
+            top = self.short_top.get(memo_key)
+            if top is None:
+                top = self.short_top[memo_key] = self._ranked(prefix, kinds, SUGGEST_MAX_LIMIT)
+            return top[:limit]
+
+
+suggest_index = InvalidatedIndex(SuggestIndex.build, SUGGEST_REBUILD_SECONDS)
+
+
+@receiver(post_save, sender=CollaboratorProfile)
+@receiver(post_save, sender=JobPost)
+@receiver(post_save, sender=CreatorProfile)
+def suggest_source_saved(sender, instance, **kwargs):
+    entries = source_entries(instance)
+    suggest_index.apply(lambda ix: ix.update_source((sender._meta.label, instance.pk), entries))
+
+
+@receiver(post_delete, sender=CollaboratorProfile)
+@receiver(post_delete, sender=JobPost)
+@receiver(post_delete, sender=CreatorProfile)
+def suggest_source_deleted(sender, instance, **kwargs):
+    suggest_index.apply(lambda ix: ix.update_source((sender._meta.label, instance.pk), set()))
+
+
+# =========================================================
+# 🔹 ENDPOINT
+# =========================================================
+@router.get("/suggest")
+def suggest(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=SUGGEST_MAX_LIMIT),
+    type: Optional[str] = Query(None, description="skill | job_title | creator (comma-separated)")
+):
+    """ Typeahead completions for skills, posted job titles and creator names. """
+    kinds = None
+    if type:
+        kinds = {t.strip() for t in type.split(",") if t.strip()}
+        invalid = kinds - set(SUGGEST_TYPES)
+        if invalid or not kinds:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown type '{', '.join(sorted(invalid)) or type}'. Use: {', '.join(SUGGEST_TYPES)}"
+            )
+    return suggest_index.get().suggest(prefix, limit, kinds)
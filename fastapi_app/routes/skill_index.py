@@ -0,0 +1,103 @@
+import fastapi_app.django_setup
+
+import re
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from creator_app.models import CollaboratorProfile, CollaboratorSkill
+
+_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+TERM_MAX_LENGTH = 100
+
+
+# =========================================================
+# 🔹 NORMALIZATION
+# =========================================================
+def normalize_term(value) -> str:
+    return " ".join(str(value or "").lower().split())[:TERM_MAX_LENGTH]
+
+
+def split_words(value) -> list:
+    """ "UI/UX Designer" → ["ui", "ux", "designer"]; keeps c++, c#, node.js intact. """
+    return [w.strip(".") for w in _WORD_RE.findall(str(value or "").lower()) if len(w.strip(".")) > 1]
+
+
+def as_skill_list(skills) -> list:
+    """ profile.skills is a JSON list, but legacy rows hold a comma-separated string. """
+    if isinstance(skills, str):
+        return [s.strip() for s in skills.split(",") if s.strip()]
+    return [s for s in (skills or []) if isinstance(s, str) and s.strip()]
+
+
+def profile_terms(profile) -> set:
+    """ {(term, kind)} for a collaborator profile. """
+    terms = set()
+    category = normalize_term(profile.skill_category)
+    if category:
+        terms.add((category, "category"))
+    for skill in as_skill_list(profile.skills):
+        terms.add((normalize_term(skill), "skill"))
+    for source in [profile.skill_category] + as_skill_list(profile.skills):
+        for word in split_words(source):
+            terms.add((word[:TERM_MAX_LENGTH], "word"))
+    return terms
+
+
+# =========================================================
+# 🔹 MAINTENANCE (profile save / edit)
+# =========================================================
+def sync_profile_skills(profile):
+    wanted = profile_terms(profile)
+    existing = {
+        (row.term, row.kind): row.id
+        for row in CollaboratorSkill.objects.filter(profile=profile)
+    }
+
+    stale_ids = [row_id for key, row_id in existing.items() if key not in wanted]
+    missing = [
+        CollaboratorSkill(profile=profile, term=term, kind=kind)
+        for term, kind in wanted if (term, kind) not in existing
+    ]
+
+    with transaction.atomic():
+        if stale_ids:
+            CollaboratorSkill.objects.filter(id__in=stale_ids).delete()
+        if missing:
+            CollaboratorSkill.objects.bulk_create(missing, ignore_conflicts=True)
+
+
+@receiver(post_save, sender=CollaboratorProfile)
+def collaborator_skills_changed(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not {"skills", "skill_category"} & set(update_fields):
+        return
+    sync_profile_skills(instance)
+
+
+# =========================================================
+# 🔹 LOOKUPS
+# =========================================================
+def profile_ids_with_skill_prefix(prefix: str):
+    """ Subquery of profile ids having any term starting with `prefix` (index range scan). """
+    return (
+        CollaboratorSkill.objects
+        .filter(term__startswith=normalize_term(prefix))
+        .values("profile_id")
+    )
+
+
+def profile_ids_with_all_skills(skills):
+    """ Subquery of profile ids that have every one of `skills` (skill or category). """
+    terms = {normalize_term(s) for s in skills if normalize_term(s)}
+    return (
+        CollaboratorSkill.objects
+        .filter(term__in=terms, kind__in=["skill", "category"])
+        .values("profile_id")
+        .annotate(n=Count("term", distinct=True))
+        .filter(n=len(terms))
+        .values("profile_id")
+    )
+
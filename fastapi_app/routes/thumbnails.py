@@ -0,0 +1,120 @@
+import fastapi_app.django_setup
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from PIL import Image, ImageOps
+
+from creator_app.models import Message, PortfolioItem, UserData
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+THUMB_SIZES = {
+    "sm": 160,   # avatars, chat list
+    "md": 480,   # chat bubbles, portfolio grid
+    "lg": 1080,  # lightbox preview
+}
+THUMB_ROOT = "thumbs"
+THUMB_EXTENSIONS = [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"]
+
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("THUMBNAIL_WORKERS", 2)),
+    thread_name_prefix="thumbs"
+)
+
+
+# =========================================================
+# 🔹 PATH HELPERS
+# =========================================================
+def is_thumbnailable(file_name: str | None) -> bool:
+    if not file_name:
+        return False
+    return os.path.splitext(file_name)[1].lower() in THUMB_EXTENSIONS
+
+
+def thumb_name(file_name: str, size: str) -> str:
+    """ message_files/ab/abc.png → thumbs/md/message_files/ab/abc.png.webp """
+    return f"{THUMB_ROOT}/{size}/{file_name}.webp"
+
+
+def thumb_path(file_obj, size: str = "md"):
+    """
+    Relative media path of an already generated thumbnail, else None.
+    Callers build the URL the same way they build the original file URL.
+    """
+    name = getattr(file_obj, "name", file_obj)
+    if not is_thumbnailable(name):
+        return None
+    relative = thumb_name(name, size)
+    if os.path.exists(os.path.join(settings.MEDIA_ROOT, relative)):
+        return relative
+    return None
+
+
+# =========================================================
+# 🔹 GENERATION (worker pool)
+# =========================================================
+def generate_thumbnails(file_name: str):
+    source = os.path.join(settings.MEDIA_ROOT, file_name)
+    if not os.path.exists(source):
+        return
+
+    source_mtime = os.path.getmtime(source)
+
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+        for size, max_px in THUMB_SIZES.items():
+            target = os.path.join(settings.MEDIA_ROOT, thumb_name(file_name, size))
+            if os.path.exists(target) and os.path.getmtime(target) >= source_mtime:
+                continue
+
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            thumb = img.copy()
+            thumb.thumbnail((max_px, max_px))
+            tmp = f"{target}.tmp"
+            thumb.save(tmp, "WEBP", quality=80, method=4)
+            os.replace(tmp, target)
+
+
+def _run(file_name: str):
+    try:
+        generate_thumbnails(file_name)
+    except Exception as e:
+        print(f"❌ Thumbnail generation failed for {file_name}:", e)
+
+
+def enqueue_thumbnails(file_obj):
+    name = getattr(file_obj, "name", file_obj)
+    if not is_thumbnailable(name):
+        return
+    if all(thumb_path(name, size) for size in THUMB_SIZES):
+        return
+    _executor.submit(_run, name)
+
+
+# =========================================================
+# 🔹 TRIGGERS (on create / file change)
+# =========================================================
+@receiver(post_save, sender=Message)
+def message_thumbnails(sender, instance, **kwargs):
+    if instance.file:
+        enqueue_thumbnails(instance.file)
+
+
+@receiver(post_save, sender=PortfolioItem)
+def portfolio_thumbnails(sender, instance, **kwargs):
+    if instance.file:
+        enqueue_thumbnails(instance.file)
+
+
+@receiver(post_save, sender=UserData)
+def profile_picture_thumbnails(sender, instance, **kwargs):
+    if instance.profile_picture:
+        enqueue_thumbnails(instance.profile_picture)
@@ -0,0 +1,85 @@
+import fastapi_app.django_setup
+
+import calendar
+from datetime import date, datetime, timedelta
+
+from django.db.models import DateTimeField
+from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
+
+TRUNC_FUNCTIONS = {
+    "day": TruncDay,
+    "week": TruncWeek,    # ISO week, starts Monday
+    "month": TruncMonth,
+}
+
+
+# =========================================================
+# 🔹 BUCKET BOUNDARIES
+# =========================================================
+def bucket_start(day: date, unit: str) -> date:
+    if unit == "week":
+        return day - timedelta(days=day.weekday())
+    if unit == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start: date, unit: str) -> date:
+    if unit == "week":
+        return start + timedelta(weeks=1)
+    if unit == "month":
+        return (start + timedelta(days=calendar.monthrange(start.year, start.month)[1])).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_starts(start: date, end: date, unit: str):
+    """ Every bucket start between start and end (inclusive), oldest first. """
+    current = bucket_start(start, unit)
+    while current <= end:
+        yield current
+        current = next_bucket(current, unit)
+
+
+# =========================================================
+# 🔹 GROUPED AGGREGATION (one query)
+# =========================================================
+def time_buckets(queryset, date_field: str, unit: str, start: date, end: date, **measures):
+    """
+    One GROUP BY over Trunc<unit>(date_field) for rows with start <= date <= end.
+
+        time_buckets(BillingHistory.objects.filter(status="paid"), "paid_on", "month",
+                     date(2025, 1, 1), date(2025, 12, 31), revenue=Sum("amount"))
+
+    Returns {bucket_start: {measure_name: value}} with every bucket present
+    (missing buckets / NULL sums are 0), in chronological order.
+    """
+    if isinstance(start, datetime) or isinstance(end, datetime):
+        raise ValueError("time_buckets() expects date bounds")
+
+    # DateTimeField → compare on the (current timezone) date, like `__date=` elsewhere
+    lookup = date_field
+    if isinstance(queryset.model._meta.get_field(date_field), DateTimeField):
+        lookup = f"{date_field}__date"
+
+    trunc = TRUNC_FUNCTIONS[unit]
+    grouped = (
+        queryset
+        .filter(**{f"{lookup}__gte": start, f"{lookup}__lte": end})
+        .annotate(bucket=trunc(date_field))
+        .values("bucket")
+        .annotate(**measures)
+        .order_by()
+    )
+
+    found = {}
+    for row in grouped:
+        bucket = row.pop("bucket")
+        if isinstance(bucket, datetime):
+            bucket = bucket.date()
+        found[bucket] = row
+
+    series = {}
+    for b in bucket_starts(start, end, unit):
+        values = found.get(b, {})
+        series[b] = {name: values.get(name) or 0 for name in measures}
+    return series
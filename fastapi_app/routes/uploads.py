@@ -0,0 +1,154 @@
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+# =========================================================
+# 🔹 CONFIG
+# =========================================================
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+MAX_CHAT_UPLOAD_BYTES = int(os.getenv("MAX_CHAT_UPLOAD_MB", 25)) * 1024 * 1024
+
+# Multipart boundaries + the other form fields
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+# =========================================================
+# 🔹 STREAMING, CONTENT-ADDRESSED SAVE
+# =========================================================
+def _file_extension(filename: str | None) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    # Keep it short + safe, it ends up in a URL
+    return ext if ext[1:].isalnum() and len(ext) <= 10 else ""
+
+
+def _open_for_write(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, "wb")
+
+
+def _finalize(tmp_path: str, final_path: str):
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    if os.path.exists(final_path):
+        # Identical content already stored → dedupe
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, final_path)
+
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload_streamed(upload: UploadFile, folder: str, max_bytes: int) -> dict:
+    """
+    Writes `upload` in UPLOAD_CHUNK_SIZE pieces (disk I/O off the event loop),
+    hashing with SHA-256 as it goes, and stores it as
+    MEDIA_ROOT/<folder>/<sha[:2]>/<sha><ext>.
+
+    Returns {"path": <relative media path>, "sha256": ..., "size": ...}.
+    Raises 413 as soon as the size limit is crossed.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+
+    media_root = str(settings.MEDIA_ROOT)
+    tmp_path = os.path.join(media_root, folder, ".tmp", uuid.uuid4().hex)
+
+    hasher = hashlib.sha256()
+    size = 0
+
+    out = await run_in_threadpool(_open_for_write, tmp_path)
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"File too large (max {max_bytes // (1024 * 1024)} MB)")
+            hasher.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        await run_in_threadpool(out.close)
+        await run_in_threadpool(_discard, tmp_path)
+        raise
+    await run_in_threadpool(out.close)
+
+    digest = hasher.hexdigest()
+    relative_path = f"{folder}/{digest[:2]}/{digest}{_file_extension(upload.filename)}"
+    await run_in_threadpool(_finalize, tmp_path, os.path.join(media_root, relative_path))
+
+    return {"path": relative_path, "sha256": digest, "size": size}
+
+
+# =========================================================
+# 🔹 EARLY REJECT MIDDLEWARE
+# =========================================================
+class UploadSizeLimitMiddleware:
+    """
+    Caps the request body on the configured paths. A Content-Length over
+    the limit is rejected before anything is read; chunked / unlabelled
+    bodies are counted as they arrive and cut off with a 413 as soon as the
+    running total passes the limit, so the multipart parser never spools
+    more than `limit` bytes.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    def _too_large(self, limit):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Upload too large (max {limit // (1024 * 1024)} MB)"}
+        )
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            await self._too_large(limit)(scope, receive, send)
+            return
+
+        state = {"received": 0, "over": False, "started": False}
+
+        async def limited_receive():
+            if state["over"]:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > limit:
+                    # Looks like a client disconnect to the app: it stops reading
+                    state["over"] = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            if state["over"] and not state["started"]:
+                return  # the app's own reply to the cut-off body is replaced below
+            if message["type"] == "http.response.start":
+                state["started"] = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not state["over"]:
+                raise
+
+        if state["over"] and not state["started"]:
+            await self._too_large(limit)(scope, receive, send)
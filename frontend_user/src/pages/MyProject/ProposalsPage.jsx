@@ -13,6 +13,30 @@ export default function ProposalsPage() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [expandedSkills, setExpandedSkills] = useState({});
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // One page of the inbox; the cursor of the next page comes in X-Next-Cursor
+  const fetchProposalsPage = async (cursor = null) => {
+    const res = await api.get(`/proposals/GetProposalsForCreator/${userData.id}`, {
+      params: cursor ? { cursor } : {}
+    });
+    return { items: res.data.proposals || [], next: res.headers["x-next-cursor"] || null };
+  };
+
+  const loadMoreProposals = async () => {
+    if (!nextCursor || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const { items, next } = await fetchProposalsPage(nextCursor);
+      setProposals(prev => [...prev, ...items]);
+      setNextCursor(next);
+    } catch (err) {
+      console.error("Failed to load more proposals", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
 
   const formatEarnings = (amount) => {
@@ -43,10 +67,9 @@ export default function ProposalsPage() {
       );
 
       // Backend auto-rejects others → refetch
-      const res = await api.get(
-        `/proposals/GetProposalsForCreator/${userData.id}`
-      );
-      setProposals(res.data.proposals || []);
+      const { items, next } = await fetchProposalsPage();
+      setProposals(items);
+      setNextCursor(next);
 
     } catch (err) {
       console.error(err);
@@ -83,8 +106,9 @@ export default function ProposalsPage() {
       try {
         setLoading(true);
         // Using dynamic creator ID from context
-        const res = await api.get(`/proposals/GetProposalsForCreator/${userData.id}`);
-        setProposals(res.data.proposals || []);
+        const { items, next } = await fetchProposalsPage();
+        setProposals(items);
+        setNextCursor(next);
         setError("");
       } catch (err) {
         setError("Database Connection Error. Check backend logs for 500 status.");
@@ -145,7 +169,8 @@ Select wallet for free-free transactions or card for secure payments.</p>
               ) : proposals.length === 0 ? (
                 <div className="text-center py-20 text-gray-400 italic">No proposals found in database for this creator.</div>
               ) : (
-                proposals.map((item) => (
+                <>
+                {proposals.map((item) => (
                   <div key={item.id} className="bg-white rounded-[15px] border border-gray-100 p-6 md:p-8 shadow-[0_2px_15px_rgba(0,0,0,0.03)] hover:shadow-md transition-all">
 
                     {/* TOP INFO ROW */}
@@ -265,7 +290,21 @@ Select wallet for free-free transactions or card for secure payments.</p>
                     </div>
 
                   </div>
-                ))
+                ))}
+
+                {nextCursor && (
+                  <div className="flex justify-center pt-2">
+                    <button
+                      onClick={loadMoreProposals}
+                      disabled={loadingMore}
+                      className="px-8 py-2 rounded-full text-[13px] font-semibold
+  border border-[#6b4fa3] text-[#6b4fa3] hover:bg-purple-50 transition disabled:opacity-50"
+                    >
+                      {loadingMore ? "Loading..." : "Load more"}
+                    </button>
+                  </div>
+                )}
+                </>
               )}
             </div>
           </div>